@@ -1,8 +1,6 @@
 from agents import (
 	Agent, 
 	Runner, 
-	AsyncOpenAI, 
-	OpenAIChatCompletionsModel, 
 	set_tracing_disabled,  
 	RunContextWrapper, 
 	output_guardrail,
@@ -19,25 +17,49 @@ from pydantic import BaseModel
 from typing import Any
 import asyncio
 import json
+from deadline import RequestContext, deadline_run_config, time_left, within_deadline
+from political_filter import political_filter
+from verdict_cache import VerdictCache
+from response_cache import CachedModel
+from model_router import RoutedModel
+from my_config import get_model
 
 load_dotenv()
 set_tracing_disabled(True)
 
-key = config("GEMINI_API_KEY")
-base_url = config("GEMINI_BASE_URL")
+# Upper bound (seconds) for the nested checker run; shortened to the request's remaining budget
+GUARDRAIL_TIMEOUT = config("GUARDRAIL_TIMEOUT", default=10.0, cast=float)
 
-gemini_client = AsyncOpenAI(api_key=key, base_url=base_url)
+# Shared adapters over the pooled, rate-limited Gemini client (see my_config.py)
+gemini_model = get_model("gemini-2.5-pro")
+# The checker's calls queue behind the user-facing answers
+gemini_guardrail_model = get_model("gemini-2.5-pro", priority="guardrail")
 
-gemini_model = OpenAIChatCompletionsModel(
-    model="gemini-2.5-pro",
-    openai_client=gemini_client,
-)
+# Cheaper tier for simple turns; RoutedModel picks per turn and escalates to gemini_model on failure.
+# Each tier is cached on its own, so a stored reply is keyed by the model that wrote it
+gemini_fast_model = get_model(config("GEMINI_FAST_MODEL", default="gemini-2.5-flash"))
+routed_model = RoutedModel(fast=CachedModel(gemini_fast_model), strong=CachedModel(gemini_model))
 
 # --- Output model ---
 class PoliticalCheckOutput(BaseModel):
     is_political: bool
     reason: str
 
+checker_agent = Agent(
+	"OutputGuardrailAgent",
+	instructions=(
+		"You are a strict classifier. Read the given text and determine if it contains political topics "
+		"or references to political figures. "
+		"Respond ONLY with a single JSON object matching this schema: "
+		'{"is_political": boolean, "reason": string}. '
+		"No extra words, no code fences, no prefixes or suffixes."
+	),
+	model=gemini_guardrail_model,
+)
+
+# Checker verdicts by output text; editing the checker's instructions invalidates them
+output_verdicts = VerdictCache("political_output", checker_agent.instructions)
+
 @output_guardrail
 async def check_output(
 	ctx: RunContextWrapper[Any],
@@ -47,19 +69,28 @@ async def check_output(
 	"""
 	Blocks political content in agent responses.
 	"""
-	checker_agent = Agent(
-		"OutputGuardrailAgent",
-		instructions=(
-			"You are a strict classifier. Read the given text and determine if it contains political topics "
-			"or references to political figures. "
-			"Respond ONLY with a single JSON object matching this schema: "
-			'{"is_political": boolean, "reason": string}. '
-			"No extra words, no code fences, no prefixes or suffixes."
-		),
-		model=gemini_model,
-	)
+	# Clear cases are decided locally; only ambiguous text costs an LLM call
+	text = input_data if isinstance(input_data, str) else str(input_data)
+	verdict = political_filter.check(text)
+	if verdict.is_political is not None:
+		parsed = PoliticalCheckOutput(is_political=verdict.is_political, reason=verdict.reason)
+		return GuardrailFunctionOutput(output_info=parsed, tripwire_triggered=parsed.is_political)
+
+	cached = output_verdicts.get(text)
+	if cached is not None:
+		parsed = PoliticalCheckOutput(**cached)
+		return GuardrailFunctionOutput(output_info=parsed, tripwire_triggered=parsed.is_political)
+
+	timeout = time_left(ctx, GUARDRAIL_TIMEOUT)
+	try:
+		if timeout <= 0:
+			raise TimeoutError
+		result = await asyncio.wait_for(Runner.run(checker_agent, input_data, context=ctx.context), timeout)
+	except TimeoutError:
+		# Same fallback as an unparseable verdict: let the answer through
+		parsed = PoliticalCheckOutput(is_political=False, reason="Checker skipped: request time budget exhausted")
+		return GuardrailFunctionOutput(output_info=parsed, tripwire_triggered=False)
 
-	result = await Runner.run(checker_agent, input_data, context=ctx.context)
 	raw = result.final_output if isinstance(result.final_output, str) else str(result.final_output)
 
 	# Try to extract and parse JSON
@@ -70,6 +101,7 @@ async def check_output(
 		try:
 			obj = json.loads(raw[start : end + 1])
 			parsed = PoliticalCheckOutput(**obj)
+			output_verdicts.put(text, parsed.model_dump())
 		except Exception:
 			parsed = None
 
@@ -90,7 +122,8 @@ math_agent = Agent(
 		"respond exactly: 'I can only answer math questions.' "
 		"Do not add any other words."
 	),
-	model=gemini_model,
+	# Low temperature: a repeated question gets the stored answer without a model call
+	model=routed_model,
 	model_settings=ModelSettings(temperature=0.2),
 	output_guardrails=[check_output]
 )
@@ -124,11 +157,15 @@ async def main(message: cl.Message):
     message_history = cl.user_session.get("message_history")
     message_history.append({"role": "user", "content": user_input})
 
-    # Run the agent with the user input
-    result = Runner.run_sync(math_agent, user_input)
-
-    # Get the agent's response
-    response = result.final_output
+    # Run the agent with the user input and a fresh latency budget that bounds the whole run
+    context = RequestContext()
+    try:
+        async with within_deadline(context):
+            result = await Runner.run(math_agent, user_input, context=context, run_config=deadline_run_config(context))
+        # Get the agent's response
+        response = result.final_output
+    except TimeoutError:
+        response = "Sorry, that took too long to answer. Please try again."
 
     # Update message history with the agent's response
     message_history.append({"role": "assistant", "content": response})
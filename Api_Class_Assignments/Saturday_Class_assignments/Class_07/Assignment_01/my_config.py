@@ -0,0 +1,68 @@
+import importlib.util
+
+import httpx
+from agents import (
+    OpenAIChatCompletionsModel,
+    set_tracing_export_api_key,
+    RunConfig,
+)
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+from decouple import config
+from rate_limiter import PRIORITY_HEADER, ScheduledTransport, scheduler
+
+# Required for Gemini via OpenAI-compatible endpoint
+api_key = config("GEMINI_API_KEY")
+base_url = config("GEMINI_BASE_URL", default="https://generativelanguage.googleapis.com/openai")
+# Use a free-tier friendlier model to avoid 429s
+model_name = config("GEMINI_MODEL_NAME", default="gemini-2.5-flash")
+
+# Only set tracing if you have a dedicated tracing key; don't use your model API key
+tracing_key = config("TRACING_API_KEY", default=None)
+if tracing_key:
+    set_tracing_export_api_key(tracing_key)
+
+# Connection pool and timeouts for every model call in this process
+MODEL_POOL_SIZE = config("MODEL_POOL_SIZE", default=20, cast=int)
+MODEL_TIMEOUT = config("MODEL_TIMEOUT", default=60.0, cast=float)
+MODEL_CONNECT_TIMEOUT = config("MODEL_CONNECT_TIMEOUT", default=5.0, cast=float)
+MODEL_KEEPALIVE_EXPIRY = config("MODEL_KEEPALIVE_EXPIRY", default=60.0, cast=float)
+# HTTP/2 multiplexes concurrent calls over one connection; needs the optional h2 package
+MODEL_HTTP2 = config("MODEL_HTTP2", default=True, cast=bool) and importlib.util.find_spec("h2") is not None
+
+# One keep-alive pool: agents, guardrail agents and handoffs reuse the same sockets and TLS sessions.
+# Every request first waits for the rate-limit scheduler (see rate_limiter.py)
+http_client = DefaultAsyncHttpxClient(
+    timeout=httpx.Timeout(MODEL_TIMEOUT, connect=MODEL_CONNECT_TIMEOUT),
+    transport=ScheduledTransport(
+        httpx.AsyncHTTPTransport(
+            http2=MODEL_HTTP2,
+            limits=httpx.Limits(
+                max_connections=MODEL_POOL_SIZE,
+                max_keepalive_connections=MODEL_POOL_SIZE,
+                keepalive_expiry=MODEL_KEEPALIVE_EXPIRY,
+            ),
+        ),
+        scheduler,
+    ),
+)
+
+gemini_client = AsyncOpenAI(api_key=api_key, base_url=base_url, http_client=http_client)
+
+_models: dict[tuple[str, str], OpenAIChatCompletionsModel] = {}
+
+def get_model(name: str = model_name, priority: str = "interactive") -> OpenAIChatCompletionsModel:
+    """
+    Returns the shared adapter for a model; every adapter sends through the same pooled client.
+
+    `priority` ("interactive", "guardrail" or "batch") orders this adapter's
+    calls in the scheduler queue; use "guardrail" for classifier agents so
+    user-facing answers go first.
+    """
+    model = _models.get((name, priority))
+    if model is None:
+        client = gemini_client.with_options(default_headers={PRIORITY_HEADER: priority})
+        model = _models[(name, priority)] = OpenAIChatCompletionsModel(model=name, openai_client=client)
+    return model
+
+gemini_model = get_model()
+config = RunConfig(model=gemini_model, tracing_disabled=True)
\ No newline at end of file
@@ -0,0 +1,45 @@
+import pytest
+
+from political_filter import PoliticalFilter
+
+
+@pytest.fixture
+def political_filter():
+    return PoliticalFilter()
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "In a class election, 18 of 30 students voted for Ali. What percent of the class is that?",
+        "In an election, 60% of 2,500 voters chose candidate A. How many voters chose A?",
+        "The ballot problem: candidate A gets p votes and B gets q votes. What is the probability A stays ahead?",
+        "In a card game, hearts are trump. If you draw 5 cards, what is the probability of at least one trump?",
+        "A PPP loan of $20,000 has 1% interest. Calculate the interest after 2 years.",
+        "The parliament has 342 seats and a party holds 3/5 of them. How many seats is that?",
+        "Modi is the plural of modus; find the mode of 3, 4, 4, 5.",
+    ],
+)
+def test_math_word_problem_is_never_blocked_locally(political_filter, text):
+    assert political_filter.check(text).is_political is not True
+    assert political_filter.blocks(text) is None
+
+
+@pytest.mark.parametrize("term", ["trump", "modi", "gop", "tory", "ppp", "pti", "election", "parliament", "ballot"])
+def test_ambiguous_term_alone_escalates(political_filter, term):
+    verdict = political_filter.check(f"Tell me about {term}.")
+    assert verdict.tier == "llm"
+    assert verdict.is_political is None
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "Donald Trump won the election.",
+        "Trump and the Tories lost the election in parliament.",
+        "The prime minister resigned.",
+    ],
+)
+def test_clearly_political_text_is_blocked_locally(political_filter, text):
+    assert political_filter.check(text).is_political is True
+    assert political_filter.blocks(text) is not None
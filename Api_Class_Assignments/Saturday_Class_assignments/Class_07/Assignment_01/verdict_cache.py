@@ -0,0 +1,106 @@
+# verdict_cache.py
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Any
+from decouple import config
+
+# In-memory entries per guardrail, and an optional SQLite file that keeps verdicts across restarts
+VERDICT_CACHE_SIZE = config("VERDICT_CACHE_SIZE", default=4096, cast=int)
+VERDICT_CACHE_PATH = config("VERDICT_CACHE_PATH", default="")
+
+def _digest(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+def normalize_text(value: Any) -> str:
+    """Collapses case and whitespace so near-identical texts (or input item lists) share a verdict."""
+    if not isinstance(value, str):
+        value = json.dumps(value, sort_keys=True, default=str)
+    return " ".join(value.split()).casefold()
+
+class VerdictCache:
+    """
+    Content-hash -> guardrail verdict, with an LRU in memory and optional SQLite persistence.
+
+    The version is a hash of the guardrail prompt, so editing the prompt
+    invalidates every verdict the old prompt produced.
+    """
+
+    def __init__(
+        self,
+        guardrail: str,
+        prompt: str,
+        path: str = VERDICT_CACHE_PATH,
+        max_size: int = VERDICT_CACHE_SIZE,
+    ):
+        self.guardrail = guardrail
+        self.version = _digest(prompt)[:12]
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._memory: OrderedDict[str, dict] = OrderedDict()
+        self._lock = threading.Lock()
+
+        self._db = None
+        if path:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS verdicts (guardrail TEXT NOT NULL, key TEXT NOT NULL, "
+                "version TEXT NOT NULL, verdict TEXT NOT NULL, PRIMARY KEY (guardrail, key))"
+            )
+            # Verdicts from an older prompt can never be used again
+            self._db.execute(
+                "DELETE FROM verdicts WHERE guardrail = ? AND version != ?", (guardrail, self.version)
+            )
+            self._db.commit()
+
+    def key(self, text: Any) -> str:
+        return _digest(f"{self.version}\n{normalize_text(text)}")
+
+    def get(self, text: Any) -> dict | None:
+        """Returns the cached verdict (as a dict) for this text, or None on a miss."""
+        key = self.key(text)
+        with self._lock:
+            verdict = self._memory.get(key)
+            if verdict is None and self._db is not None:
+                row = self._db.execute(
+                    "SELECT verdict FROM verdicts WHERE guardrail = ? AND key = ?", (self.guardrail, key)
+                ).fetchone()
+                if row is not None:
+                    verdict = json.loads(row[0])
+                    self._remember(key, verdict)
+            if verdict is None:
+                self.misses += 1
+                return None
+            self._memory.move_to_end(key)
+            self.hits += 1
+            return verdict
+
+    def put(self, text: Any, verdict: dict) -> None:
+        """Stores a verdict from the classifier; only cache real verdicts, not fallbacks."""
+        key = self.key(text)
+        with self._lock:
+            self._remember(key, verdict)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO verdicts (guardrail, key, version, verdict) VALUES (?, ?, ?, ?)",
+                    (self.guardrail, key, self.version, json.dumps(verdict)),
+                )
+                self._db.commit()
+
+    def stats(self) -> dict:
+        """Returns hit/miss counters for monitoring."""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "memory_entries": len(self._memory)}
+
+    def _remember(self, key: str, verdict: dict) -> None:
+        self._memory[key] = verdict
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_size:
+            self._memory.popitem(last=False)
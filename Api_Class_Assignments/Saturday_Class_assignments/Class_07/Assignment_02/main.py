@@ -1,23 +1,26 @@
 # hotel_assistant.py
 from typing import Any
-from agents import Agent, Runner, RunContextWrapper, AsyncOpenAI, OpenAIChatCompletionsModel, set_tracing_disabled, input_guardrail,GuardrailFunctionOutput, InputGuardrailTripwireTriggered
+from agents import Agent, Runner, RunContextWrapper, set_tracing_disabled, input_guardrail,GuardrailFunctionOutput, InputGuardrailTripwireTriggered
 from decouple import config
 from dotenv import load_dotenv
 from pydantic import BaseModel
 import chainlit as cl
+import asyncio
+from deadline import RequestContext, deadline_run_config, time_left, within_deadline
+from verdict_cache import VerdictCache
+from topic_router import topic_router
+from my_config import get_model
 
 load_dotenv()
 set_tracing_disabled(True)
 
-key = config("GEMINI_API_KEY")
-base_url = config("GEMINI_BASE_URL")
+# Upper bound (seconds) for the nested classifier run; shortened to the request's remaining budget
+GUARDRAIL_TIMEOUT = config("GUARDRAIL_TIMEOUT", default=10.0, cast=float)
 
-gemini_client = AsyncOpenAI(api_key=key, base_url=base_url)
-
-gemini_model = OpenAIChatCompletionsModel(
-    model="gemini-2.5-pro",
-    openai_client=gemini_client,
-)
+# Shared adapters over the pooled, rate-limited Gemini client (see my_config.py)
+gemini_model = get_model("gemini-2.5-pro")
+# The classifier's calls queue behind the user-facing answers
+gemini_guardrail_model = get_model("gemini-2.5-pro", priority="guardrail")
 
 # Example hotel data
 hotels_data = {
@@ -56,13 +59,51 @@ guardrial_agent = Agent(
         "- Hotel booking, accommodation, rooms, pricing for these hotels "
         "Return is_query_about_Grand_Palace_Hotel_or_Sea_View_Hotel = false for any other topics like weather, politics, general questions, etc."
     ),
-    model=gemini_model,
+    model=gemini_guardrail_model,
     output_type=MyDataType
 )
 
+# Classifier verdicts by query text; editing the classifier's instructions invalidates them
+input_verdicts = VerdictCache("hotel_input", guardrial_agent.instructions)
+
 @input_guardrail
 async def guardrial_input_function(ctx:RunContextWrapper, agent, input):
-    result = await Runner.run(guardrial_agent, input=input, context= ctx.context)
+    # Clearly off-topic queries are rejected locally; everything else reaches the classifier
+    if isinstance(input, str):
+        route = topic_router.route(input)
+        if route.rejects:
+            return GuardrailFunctionOutput(
+                output_info=MyDataType(
+                    is_query_about_Grand_Palace_Hotel_or_Sea_View_Hotel=False,
+                    reason=f"Local topic router (confidence={route.confidence:.2f}, similarity={route.similarity:.2f})",
+                ),
+                tripwire_triggered=True,
+            )
+
+    # Repeated (or near-identical) questions skip the classifier call
+    cached = input_verdicts.get(input)
+    if cached is not None:
+        verdict = MyDataType(**cached)
+        return GuardrailFunctionOutput(
+            output_info=verdict,
+            tripwire_triggered=not verdict.is_query_about_Grand_Palace_Hotel_or_Sea_View_Hotel
+        )
+
+    timeout = time_left(ctx, GUARDRAIL_TIMEOUT)
+    try:
+        if timeout <= 0:
+            raise TimeoutError
+        result = await asyncio.wait_for(Runner.run(guardrial_agent, input=input, context= ctx.context), timeout)
+    except TimeoutError:
+        # No time left to classify: let the query through rather than stall the user
+        return GuardrailFunctionOutput(
+            output_info=MyDataType(
+                is_query_about_Grand_Palace_Hotel_or_Sea_View_Hotel=True,
+                reason="Classifier skipped: request time budget exhausted",
+            ),
+            tripwire_triggered=False,
+        )
+    input_verdicts.put(input, result.final_output.model_dump())
     return GuardrailFunctionOutput(
         output_info=result.final_output,
         tripwire_triggered=not result.final_output.is_query_about_Grand_Palace_Hotel_or_Sea_View_Hotel
@@ -97,16 +138,22 @@ async def start_chat():
 # Chainlit event handler for incoming messages
 @cl.on_message
 async def main(message: cl.Message):
+    context = RequestContext()  # fresh latency budget for this request, bounding the whole run
     try:
-        result = await Runner.run(
-            starting_agent=agent,
-            input=message.content
-        )
+        async with within_deadline(context):
+            result = await Runner.run(
+                starting_agent=agent,
+                input=message.content,
+                context=context,
+                run_config=deadline_run_config(context),
+            )
         await cl.Message(content=result.final_output).send()
     except InputGuardrailTripwireTriggered as e:
         await cl.Message(
             content="❌ I can only help with hotel-related queries! Ask me about Grand Palace or Sea View hotels."
         ).send()
+    except TimeoutError:
+        await cl.Message(content="Sorry, that took too long to answer. Please try again.").send()
 
 # Run terminal version if not using Chainlit
 if __name__ == "__main__":
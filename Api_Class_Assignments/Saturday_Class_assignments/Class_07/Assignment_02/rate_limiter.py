@@ -0,0 +1,223 @@
+import asyncio
+import email.utils
+import heapq
+import itertools
+import logging
+import re
+import time
+
+import httpx
+from decouple import config
+
+# Client-side budget for the model endpoint (Gemini free tier: ~10 RPM / 250k TPM on flash)
+RATE_LIMIT_RPM = config("RATE_LIMIT_RPM", default=10, cast=int)
+RATE_LIMIT_TPM = config("RATE_LIMIT_TPM", default=250_000, cast=int)
+# Tokens reserved per call for the reply, on top of the estimated prompt
+RATE_LIMIT_OUTPUT_TOKENS = config("RATE_LIMIT_OUTPUT_TOKENS", default=500, cast=int)
+# Pause after a 429 that gives no Retry-After hint
+RATE_LIMIT_BACKOFF = config("RATE_LIMIT_BACKOFF", default=10.0, cast=float)
+
+# Lower value is served first
+INTERACTIVE, GUARDRAIL, BATCH = 0, 1, 2
+PRIORITIES = {"interactive": INTERACTIVE, "guardrail": GUARDRAIL, "batch": BATCH}
+# Set on a client's default headers to tag its calls; removed before the request is sent
+PRIORITY_HEADER = "x-request-priority"
+
+logger = logging.getLogger(__name__)
+
+
+def estimate_tokens(body: bytes) -> int:
+    """Rough token count of a request: ~4 bytes per token, plus the reply allowance."""
+    return len(body) // 4 + RATE_LIMIT_OUTPUT_TOKENS
+
+
+def retry_after(response: httpx.Response) -> float | None:
+    """Reads the server's wait hint from Retry-After(-ms) or Gemini's retryDelay, in seconds."""
+    if "retry-after-ms" in response.headers:
+        try:
+            return float(response.headers["retry-after-ms"]) / 1000
+        except ValueError:
+            pass
+    value = response.headers.get("retry-after")
+    if value:
+        try:
+            return float(value)
+        except ValueError:
+            when = email.utils.parsedate_to_datetime(value)
+            if when is not None:
+                return max(0.0, when.timestamp() - time.time())
+    found = re.search(rb'"retryDelay"\s*:\s*"(\d+(?:\.\d+)?)s"', response.content)
+    return float(found.group(1)) if found else None
+
+
+class TokenBucket:
+    """Refills `limit` units per minute, holding at most one minute's worth."""
+
+    def __init__(self, limit: float):
+        self.limit = limit
+        self.level = limit
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.level = min(self.limit, self.level + (now - self._updated) * self.limit / 60)
+        self._updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until `amount` units are available (0 if they are now)."""
+        self._refill()
+        missing = min(amount, self.limit) - self.level
+        return max(0.0, missing * 60 / self.limit)
+
+    def take(self, amount: float) -> None:
+        self._refill()
+        self.level -= min(amount, self.limit)
+
+    def drain(self) -> None:
+        self._refill()
+        self.level = min(self.level, 0.0)
+
+
+class RateLimitScheduler:
+    """
+    Admits model calls under requests-per-minute and tokens-per-minute buckets.
+
+    Waiting calls are served by priority, then arrival order. A 429 pauses
+    every call for the server's Retry-After and halves the request rate, which
+    then grows back by one request per minute on each successful call.
+
+    The buckets are shared by the whole process; the wait queue and its
+    condition belong to one event loop and are created on first use in it.
+    """
+
+    def __init__(self, rpm: int = RATE_LIMIT_RPM, tpm: int = RATE_LIMIT_TPM):
+        self.rpm = rpm
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        # One wait queue per event loop: an asyncio.Condition cannot be shared across loops
+        self._queues: dict[asyncio.AbstractEventLoop, tuple[list[tuple[int, int]], asyncio.Condition]] = {}
+        self._seq = itertools.count()
+        self._paused_until = 0.0
+
+        self.admitted = 0
+        self.throttled = 0
+        self.timed_out = 0
+        self.max_depth = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    def _wait_queue(self) -> tuple[list[tuple[int, int]], asyncio.Condition]:
+        """Returns the running loop's wait queue and condition, creating them on first use."""
+        loop = asyncio.get_running_loop()
+        entry = self._queues.get(loop)
+        if entry is None:
+            # Forget queues whose loop has already been closed (e.g. after run_sync)
+            for stale in [l for l in self._queues if l.is_closed()]:
+                del self._queues[stale]
+            entry = self._queues[loop] = ([], asyncio.Condition())
+        return entry
+
+    async def acquire(self, tokens: int, priority: int = INTERACTIVE, timeout: float | None = None) -> None:
+        """
+        Waits until this call may be sent; the caller then sends it straight away.
+
+        Raises TimeoutError, without taking any budget, when the call is still
+        queued after `timeout` seconds.
+        """
+        queue, cond = self._wait_queue()
+        ticket = (priority, next(self._seq))
+        started = time.monotonic()
+        give_up = None if timeout is None else started + timeout
+        async with cond:
+            heapq.heappush(queue, ticket)
+            self.max_depth = max(self.max_depth, len(queue))
+            try:
+                while True:
+                    wait = None
+                    if queue[0] == ticket:
+                        wait = max(
+                            self._paused_until - time.monotonic(),
+                            self.requests.wait_time(1),
+                            self.tokens.wait_time(tokens),
+                        )
+                        if wait <= 0:
+                            break
+                    if give_up is not None:
+                        left = give_up - time.monotonic()
+                        if left <= 0:
+                            self.timed_out += 1
+                            raise TimeoutError(f"Rate-limit queue wait exceeded {timeout}s")
+                        wait = left if wait is None else min(wait, left)
+                    try:
+                        # Woken early when the queue head changes. A 429 only ever lengthens the
+                        # head's wait, so it is picked up when the head wakes and checks again
+                        await asyncio.wait_for(cond.wait(), wait)
+                    except TimeoutError:
+                        pass
+            finally:
+                # Leaves the queue whether admitted, timed out or cancelled
+                queue.remove(ticket)
+                heapq.heapify(queue)
+                cond.notify_all()
+
+            self.requests.take(1)
+            self.tokens.take(tokens)
+            waited = time.monotonic() - started
+            self.admitted += 1
+            self._wait_total += waited
+            self._wait_max = max(self._wait_max, waited)
+
+    def on_throttled(self, delay: float | None) -> None:
+        """Records a 429: pause everyone and slow down."""
+        self.throttled += 1
+        self._paused_until = max(self._paused_until, time.monotonic() + (delay or RATE_LIMIT_BACKOFF))
+        self.requests.limit = max(1.0, self.requests.limit / 2)
+        self.requests.drain()
+        logger.warning("Model endpoint returned 429; scheduler: %s", self.stats())
+
+    def on_success(self) -> None:
+        self.requests.limit = min(float(self.rpm), self.requests.limit + 1)
+
+    def stats(self) -> dict:
+        """Returns queue depth, wait times and the learned request rate for monitoring."""
+        return {
+            "queue_depth": sum(len(queue) for queue, _ in self._queues.values()),
+            "max_queue_depth": self.max_depth,
+            "admitted": self.admitted,
+            "throttled": self.throttled,
+            "timed_out": self.timed_out,
+            "avg_wait_s": round(self._wait_total / self.admitted, 3) if self.admitted else 0.0,
+            "max_wait_s": round(self._wait_max, 3),
+            "effective_rpm": round(self.requests.limit, 1),
+        }
+
+
+class ScheduledTransport(httpx.AsyncBaseTransport):
+    """httpx transport that sends every request through a RateLimitScheduler."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, scheduler: RateLimitScheduler):
+        self.transport = transport
+        self.scheduler = scheduler
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        priority = PRIORITIES.get(request.headers.pop(PRIORITY_HEADER, ""), INTERACTIVE)
+        # Queueing for the rate limit counts against the request's pool timeout, like waiting for a connection
+        timeout = request.extensions.get("timeout", {}).get("pool")
+        try:
+            await self.scheduler.acquire(estimate_tokens(request.content), priority, timeout)
+        except TimeoutError as e:
+            raise httpx.PoolTimeout(str(e), request=request) from e
+        response = await self.transport.handle_async_request(request)
+        if response.status_code == 429:
+            await response.aread()  # small error body; still readable by the caller
+            self.scheduler.on_throttled(retry_after(response))
+        elif response.status_code < 400:
+            self.scheduler.on_success()
+        return response
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+# Shared by every model call in this process
+scheduler = RateLimitScheduler()
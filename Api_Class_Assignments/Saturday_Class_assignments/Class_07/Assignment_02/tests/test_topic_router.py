@@ -0,0 +1,44 @@
+import pytest
+
+from topic_router import TopicRouter
+
+
+@pytest.fixture
+def router():
+    return TopicRouter()
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "Sea View hotel phone number",
+        "grand palace room prices",
+        "Tell me about the Grand Palace in Bangkok",
+    ],
+)
+def test_in_topic_looking_query_goes_to_the_classifier(router, query):
+    assert not router.route(query).rejects
+    assert router.stats() == {"local": 0, "fallbacks": 1}
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "Sea view apartments for sale in Karachi",
+        "Rent a house with a sea view",
+        "Grand Palace of Versailles history",
+        "Who built the grand palace in Bangkok?",
+        "Hotel Marriott Karachi price",
+        "book a room at Pearl Continental",
+    ],
+)
+def test_off_topic_with_shared_vocabulary_goes_to_the_classifier(router, query):
+    assert not router.route(query).rejects
+    assert router.stats() == {"local": 0, "fallbacks": 1}
+
+
+@pytest.mark.parametrize("query", ["Tell me a joke", "What is the price of gold today?"])
+def test_unrelated_query_is_rejected_locally(router, query):
+    route = router.route(query)
+    assert route.rejects
+    assert router.stats() == {"local": 1, "fallbacks": 0}
@@ -0,0 +1,145 @@
+# topic_router.py
+import math
+import re
+import zlib
+from collections import defaultdict
+from dataclasses import dataclass
+from decouple import config
+
+# Below either threshold the router is unsure and the LLM classifier decides. The vote alone is
+# not enough: a query that only shares words with the examples ("sea view apartments") wins it
+# with little similarity to any of them
+ROUTER_MIN_CONFIDENCE = config("ROUTER_MIN_CONFIDENCE", default=0.75, cast=float)
+ROUTER_MIN_SIMILARITY = config("ROUTER_MIN_SIMILARITY", default=0.55, cast=float)
+# Neighbours that vote, and the size of the hashed feature space
+ROUTER_K = config("ROUTER_K", default=5, cast=int)
+ROUTER_DIMENSIONS = 1 << 16
+
+# Labelled example queries: about Grand Palace / Sea View hotel or not
+IN_TOPIC_EXAMPLES = [
+    "Tell me about Grand Palace hotel",
+    "What rooms does Sea View Hotel have?",
+    "How much is a night at Grand Palace?",
+    "Price of a sea view deluxe room",
+    "Where is Sea View hotel located?",
+    "Grand Palace contact number",
+    "I want to book a luxury suite at Grand Palace",
+    "Do you have rooms available at Sea View?",
+    "Compare Grand Palace and Sea View prices",
+    "Is Grand Palace in Karachi?",
+    "Book a standard room at Grand Palace for two nights",
+    "What is the phone number of Sea View Hotel?",
+    "Sea View Hotel beachfront rooms",
+    "Which hotel is cheaper, Grand Palace or Sea View?",
+    "details of grand palace hotel",
+    "sea view hotel booking",
+    "What amenities does Grand Palace offer?",
+    "How do I reserve a room at Sea View Hotel?",
+]
+OFF_TOPIC_EXAMPLES = [
+    "What is the weather in Karachi today?",
+    "Who won the cricket match yesterday?",
+    "Tell me a joke",
+    "What is the capital of France?",
+    "Explain quantum physics",
+    "Write a poem about the sea",
+    "How do I cook biryani?",
+    "What is 25 times 4?",
+    "Who is the prime minister?",
+    "Recommend a good movie",
+    "Translate hello into Urdu",
+    "What time is it in London?",
+    "How do I learn Python programming?",
+    "Tell me about the history of Pakistan",
+    "What are the latest election results?",
+    "Book a flight to Dubai",
+    "Best restaurants near me",
+    "What is the stock price of Apple?",
+]
+
+
+def _features(text: str) -> dict[int, float]:
+    """L2-normalized hashed features: word unigrams and bigrams plus character trigrams."""
+    words = re.findall(r"\w+", text.lower())
+    grams = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+    for word in words:
+        padded = f" {word} "
+        grams += [padded[i:i + 3] for i in range(len(padded) - 2)]
+
+    vector: dict[int, float] = defaultdict(float)
+    for gram in grams:
+        vector[zlib.crc32(gram.encode("utf-8")) % ROUTER_DIMENSIONS] += 1.0
+    norm = math.sqrt(sum(v * v for v in vector.values())) or 1.0
+    return {k: v / norm for k, v in vector.items()}
+
+
+@dataclass
+class Route:
+    in_topic: bool
+    confidence: float
+    similarity: float
+
+    @property
+    def confident(self) -> bool:
+        return self.confidence >= ROUTER_MIN_CONFIDENCE and self.similarity >= ROUTER_MIN_SIMILARITY
+
+    @property
+    def rejects(self) -> bool:
+        """Confidently off-topic: the only verdict the router makes without the classifier."""
+        return self.confident and not self.in_topic
+
+
+class TopicRouter:
+    """
+    Network-free in-topic / off-topic classifier.
+
+    Queries are embedded as hashed n-gram vectors and compared (cosine) with
+    labelled examples through an inverted index; the top-k neighbours vote,
+    weighted by similarity. Only off-topic verdicts are final: n-gram overlap
+    cannot tell "Grand Palace hotel" from "the Grand Palace in Bangkok", so
+    in-topic queries always go on to the LLM classifier.
+    """
+
+    def __init__(self, in_topic: list[str] = IN_TOPIC_EXAMPLES, off_topic: list[str] = OFF_TOPIC_EXAMPLES):
+        self._labels: list[bool] = []
+        self._index: dict[int, list[tuple[int, float]]] = defaultdict(list)
+        for label, examples in ((True, in_topic), (False, off_topic)):
+            for example in examples:
+                for feature, weight in _features(example).items():
+                    self._index[feature].append((len(self._labels), weight))
+                self._labels.append(label)
+        self.local = 0
+        self.fallbacks = 0
+
+    def route(self, query: str) -> Route:
+        """Scores the query; check `rejects` before skipping the classifier."""
+        scores: dict[int, float] = defaultdict(float)
+        for feature, weight in _features(query).items():
+            for example, example_weight in self._index.get(feature, ()):
+                scores[example] += weight * example_weight
+
+        neighbours = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:ROUTER_K]
+        total = sum(score for _, score in neighbours)
+        if not total:
+            route = Route(in_topic=False, confidence=0.0, similarity=0.0)
+        else:
+            in_share = sum(score for example, score in neighbours if self._labels[example]) / total
+            route = Route(
+                in_topic=in_share >= 0.5,
+                confidence=max(in_share, 1 - in_share),
+                similarity=neighbours[0][1],
+            )
+
+        if route.rejects:
+            self.local += 1
+        else:
+            self.fallbacks += 1
+        return route
+
+    def stats(self) -> dict:
+        """Returns how many queries were rejected locally vs sent to the LLM classifier."""
+        return {"local": self.local, "fallbacks": self.fallbacks}
+
+
+# Shared by every guardrail check in this process
+topic_router = TopicRouter()
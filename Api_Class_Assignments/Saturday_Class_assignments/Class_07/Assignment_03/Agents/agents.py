@@ -1,18 +1,10 @@
-from agents import Agent, ModelSettings, AsyncOpenAI, OpenAIChatCompletionsModel
+from agents import Agent, ModelSettings
 from Tools.tools import get_order_status
 from Guardrails.Guardrail import check_input
-from decouple import config
+from my_config import get_model
 
-# Get Gemini API key and base URL
-key = config("GEMINI_API_KEY")
-base_url = config("GEMINI_BASE_URL")
-
-# Create the Async OpenAI client using Gemini (as in given code)
-gemini_client = AsyncOpenAI(api_key=key, base_url=base_url)
-gemini_model = OpenAIChatCompletionsModel(
-    model="gemini-2.0-flash",
-    openai_client=gemini_client
-)
+# Shared adapter over the process-wide pooled Gemini client (see my_config.py)
+gemini_model = get_model("gemini-2.0-flash")
 
 # Define the human agent (used for escalations)
 human_agent = Agent(
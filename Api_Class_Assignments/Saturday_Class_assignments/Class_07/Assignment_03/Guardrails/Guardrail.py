@@ -1,14 +1,18 @@
+import os
 from agents import input_guardrail, GuardrailFunctionOutput
+from Guardrails.rule_packs import RulePackEngine
+
+# Term and regex packs in Guardrails/rules/*.json; edits are picked up without a restart
+input_rules = RulePackEngine(os.path.join(os.path.dirname(os.path.abspath(__file__)), "rules"))
 
 @input_guardrail
 def check_input(ctx, agent, user_input: str) -> GuardrailFunctionOutput:
     """Block negative or sensitive input."""
-    text = user_input.lower()
-    negative_terms = ["idiot", "stupid", "hate", "pathetic", "refund", "return"]
-    if any(term in text for term in negative_terms):
+    match = input_rules.match(user_input)
+    if match is not None:
         # Tripwire triggered: stop the bot agent
         return GuardrailFunctionOutput(
-            output_info="Inappropriate or complex query detected",
+            output_info=f"Inappropriate or complex query detected ({match.pack}/{match.rule})",
             tripwire_triggered=True
         )
     return GuardrailFunctionOutput(output_info=None, tripwire_triggered=False)
@@ -0,0 +1,69 @@
+import json
+
+import pytest
+
+from Guardrails.rule_packs import RulePackEngine, load_pack
+
+
+def write_pack(directory, name, **pack):
+    path = directory / f"{name}.json"
+    path.write_text(json.dumps({"name": name, "version": 1, **pack}), encoding="utf-8")
+    return path
+
+
+def test_numbered_backreference_matches_within_its_own_rule(tmp_path):
+    write_pack(tmp_path, "insults", terms=["idiot"])
+    write_pack(tmp_path, "spam", regex=[{"id": "repeat", "pattern": r"\b(\w+) \1\b"}])
+    engine = RulePackEngine(str(tmp_path))
+
+    match = engine.match("buy buy now")
+    assert (match.pack, match.rule, match.text) == ("spam", "regex:repeat", "buy buy")
+    assert engine.match("buy now") is None
+
+
+def test_rules_may_reuse_group_names(tmp_path):
+    write_pack(tmp_path, "a", regex=[{"id": "order", "pattern": r"order (?P<n>\d+)"}])
+    write_pack(tmp_path, "b", regex=[{"id": "ticket", "pattern": r"ticket (?P<n>\d+)"}])
+    engine = RulePackEngine(str(tmp_path))
+
+    assert engine.stats()["last_error"] is None
+    assert engine.match("about ticket 42").rule == "regex:ticket"
+    assert engine.match("about order 7").rule == "regex:order"
+
+
+def test_leftmost_match_wins_across_terms_and_regex(tmp_path):
+    write_pack(tmp_path, "mixed", terms=["refund"], regex=[{"id": "stupid", "pattern": r"\bstupid\b"}])
+    engine = RulePackEngine(str(tmp_path))
+
+    assert engine.match("this stupid refund").rule == "regex:stupid"
+    assert engine.match("refund this stupid thing").rule == "term:refund"
+
+
+@pytest.mark.parametrize(
+    "pack, error",
+    [
+        ({"regex": [{"id": "bad", "pattern": "(unclosed"}]}, "broken/regex:bad"),
+        ({"regex": [{"pattern": "x"}]}, "needs a string 'id'"),
+        ({"regex": [{"id": "x", "pattern": "a"}, {"id": "x", "pattern": "b"}]}, "duplicate regex rule id"),
+        ({"terms": ["ok", ""]}, "non-empty string"),
+        ({"terms": "kill"}, "'terms' must be a list"),
+        ({"regex": {"id": "x", "pattern": "a"}}, "'regex' must be a list"),
+    ],
+)
+def test_invalid_pack_is_rejected_at_load(tmp_path, pack, error):
+    path = write_pack(tmp_path, "broken", **pack)
+    with pytest.raises(ValueError, match=error):
+        load_pack(str(path))
+
+
+def test_invalid_pack_keeps_the_previous_generation(tmp_path):
+    write_pack(tmp_path, "insults", terms=["idiot"])
+    engine = RulePackEngine(str(tmp_path), check_interval=0)
+    assert engine.match("you idiot") is not None
+
+    write_pack(tmp_path, "insults", version=2, terms=["idiot"], regex=[{"id": "bad", "pattern": "(?P<x>a)(?P<x>b)"}])
+    assert engine.match("you idiot") is not None
+    stats = engine.stats()
+    assert stats["versions"] == {"insults": 1}
+    assert stats["reload_errors"] == 1
+    assert "insults/regex:bad" in stats["last_error"]
@@ -8,13 +8,19 @@ def main():
         # Import section with individual error handling
         print("📦 Loading imports...")
         
+        import asyncio
         import json
         import os
         from dataclasses import dataclass
         
+        import httpx
         from dotenv import load_dotenv
         from pydantic import BaseModel
-        from tavily import TavilyClient
+        from tools.tavily_tool_min import cached_search, tavily_search_many, local_search, TAVILY_TIMEOUT
+        from tools.compact import compact_response
+        from tools.circuit_breaker import CircuitOpenError
+        from tools.tavily_client import PooledTavilyClient, get_tavily_client
+        from tools.deadline import Deadline, deadline_run_config, time_left, within_deadline
         
         # This is the most likely problematic import
         try:
@@ -71,28 +77,33 @@ def main():
         
         @dataclass
         class AppContext:
-            tavily: TavilyClient
+            tavily: PooledTavilyClient
+            deadline: Deadline | None = None
 
         class SearchArgs(BaseModel):
             query: str
             max_results: int | None = 5
 
         @function_tool
-        def tavily_search(ctx: RunContextWrapper[AppContext], args: SearchArgs) -> str:
+        async def tavily_search(ctx: RunContextWrapper[AppContext], args: SearchArgs) -> str:
             """Search the web via Tavily and return JSON with answer and top results."""
             print(f"🔍 Searching for: {args.query}")
+            timeout = time_left(ctx, TAVILY_TIMEOUT)
+            if timeout <= 0:
+                return json.dumps({"error": "Skipped: no time left in this request's budget."})
             try:
-                resp = ctx.context.tavily.search(args.query)
-                results = resp.get("results", [])[: (args.max_results or 5)]
-                out = {
-                    "query": resp.get("query", args.query),
-                    "answer": resp.get("answer"),
-                    "results": [
-                        {"title": r.get("title"), "url": r.get("url"), "snippet": r.get("content")}
-                        for r in results
-                    ],
-                }
-                return json.dumps(out, ensure_ascii=False)
+                # Cached for SEARCH_CACHE_TTL; identical concurrent queries share one Tavily request.
+                # Tavily applies the result limit, and the payload is trimmed to SEARCH_TOKEN_BUDGET.
+                resp = await cached_search(
+                    ctx.context.tavily, args.query, timeout, max_results=args.max_results or 5, include_answer=True
+                )
+                return json.dumps(compact_response(resp, args.query), ensure_ascii=False)
+            except CircuitOpenError as e:
+                print(f"❌ Tavily circuit open: {e}")
+                return json.dumps({"error": f"{e} Answer without web search for now."})
+            except (TimeoutError, httpx.TimeoutException):
+                print("❌ Tavily search timed out")
+                return json.dumps({"error": "Tavily search timed out."})
             except Exception as e:
                 print(f"❌ Tavily search error: {e}")
                 return json.dumps({"error": str(e)})
@@ -102,17 +113,21 @@ def main():
                 name="Web Researcher",
                 instructions=(
                     "Use the tavily_search tool for any question that needs fresh or cited facts. "
+                    "For follow-ups on a topic you already searched, use local_search first; "
+                    "it only goes to the web when earlier results are not enough. "
+                    "For broad questions, call tavily_search_many once with several reformulations "
+                    "instead of searching one phrasing at a time. "
                     "If tool output already answers the user, summarize it with URLs."
                 ),
                 model=gemini_model,
-                tools=[tavily_search],
+                tools=[tavily_search, tavily_search_many, local_search],
             )
 
         # Main execution
         print("🤖 Building agent...")
         
-        api_key = os.environ.get("TAVILY_API_KEY")
-        ctx = AppContext(tavily=TavilyClient(api_key=api_key))
+        # One keep-alive Tavily client for the whole process
+        ctx = AppContext(tavily=get_tavily_client(), deadline=Deadline.after())
         agent = build_agent()
         
         print("✅ Agent built successfully")
@@ -120,18 +135,22 @@ def main():
         # Run the agent
         print("🎯 Running agent query...")
         
-        import asyncio
-        
         async def run_agent():
             try:
-                result = await Runner.run(
-                    agent,
-                    "Summarize the latest guidance for creating function tools in the OpenAI Agents SDK.",
-                    context=ctx,
-                )
+                # The whole run, model calls included, stops when the request budget is spent
+                async with within_deadline(ctx):
+                    result = await Runner.run(
+                        agent,
+                        "Summarize the latest guidance for creating function tools in the OpenAI Agents SDK.",
+                        context=ctx,
+                        run_config=deadline_run_config(ctx),
+                    )
                 print("📋 Result:")
                 print(result.final_output)
                 return result.final_output
+            except TimeoutError:
+                print("❌ Agent execution timed out: request budget spent")
+                return None
             except Exception as e:
                 print(f"❌ Agent execution error: {e}")
                 traceback.print_exc()
@@ -0,0 +1,36 @@
+# http_pool.py
+import asyncio
+import httpx
+from decouple import config
+
+# Pool size and default timeout for every outbound tool request
+HTTP_TIMEOUT = config("HTTP_TIMEOUT", default=5.0, cast=float)
+HTTP_MAX_CONNECTIONS = config("HTTP_MAX_CONNECTIONS", default=20, cast=int)
+HTTP_KEEPALIVE_EXPIRY = config("HTTP_KEEPALIVE_EXPIRY", default=30.0, cast=float)
+
+# One client per event loop: pooled connections cannot be shared across loops
+_clients: dict[asyncio.AbstractEventLoop, httpx.AsyncClient] = {}
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Returns the shared keep-alive HTTP client for the running event loop.
+
+    The client is created on first use, so every tool call made from the same
+    Chainlit process reuses the same sockets and TLS sessions.
+    """
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        # Forget clients whose loop has already been closed (e.g. after run_sync)
+        for stale in [l for l in _clients if l.is_closed()]:
+            del _clients[stale]
+        client = httpx.AsyncClient(
+            timeout=httpx.Timeout(HTTP_TIMEOUT),
+            limits=httpx.Limits(
+                max_connections=HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=HTTP_MAX_CONNECTIONS,
+                keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+            ),
+        )
+        _clients[loop] = client
+    return client
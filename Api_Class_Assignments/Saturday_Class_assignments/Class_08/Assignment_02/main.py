@@ -1,9 +1,9 @@
 # app/agent_with_tavily.py
+import asyncio
 import json
 import os
 from dotenv import load_dotenv
 from pydantic import BaseModel, Field
-from tavily import TavilyClient
 from agents import (
     Agent,
     Runner,
@@ -17,6 +17,14 @@ from agents import (
 )
 
 from gemini_helper.core import get_gemini_model
+from tools.tavily_tool_min import cached_search, tavily_search_many, local_search, TAVILY_TIMEOUT
+from tools.compact import compact_response
+from tools.circuit_breaker import CircuitOpenError
+from tools.tavily_client import PooledTavilyClient, get_tavily_client
+from tools.deadline import Deadline, deadline_run_config, time_left, within_deadline
+from tools.political_filter import political_filter
+from tools.verdict_cache import VerdictCache
+from tools.stream_guard import run_streamed_guarded, StreamTripwireTriggered
 from decouple import config
 from dataclasses import dataclass
 from typing import Any
@@ -24,6 +32,9 @@ from typing import Any
 load_dotenv()
 set_tracing_disabled(True)
 
+# Upper bound (seconds) for the nested guardrail run; shortened to the request's remaining budget
+GUARDRAIL_TIMEOUT = config("GUARDRAIL_TIMEOUT", default=10.0, cast=float)
+
 key = config("GEMINI_API_KEY")
 base_url = config("GEMINI_BASE_URL")
 
@@ -32,32 +43,37 @@ gemini_model = get_gemini_model()
 
 @dataclass
 class AppContext:
-    tavily: Any
+    tavily: PooledTavilyClient
+    deadline: Deadline | None = None
 
 class SearchArgs(BaseModel):
     query: str
 
 # Alternative approach: Define the function tool manually
 @function_tool
-def tavily_search(ctx: RunContextWrapper[AppContext], args: SearchArgs) -> str:
+async def tavily_search(ctx: RunContextWrapper[AppContext], args: SearchArgs) -> str:
     """Search the web via Tavily and return JSON with answer and top results.
     
     Args:
         query: The search query string
     """
     print(f"🔍 Searching for: {args.query}")
+    timeout = time_left(ctx, TAVILY_TIMEOUT)
+    if timeout <= 0:
+        return json.dumps({"error": "Skipped: no time left in this request's budget.", "query": args.query})
     try:
-        resp = ctx.context.tavily.search(args.query, max_results=5)
-        results = resp.get("results", [])[:5]
-        out = {
-            "query": resp.get("query", args.query),
-            "answer": resp.get("answer"),
-            "results": [
-                {"title": r.get("title"), "url": r.get("url"), "snippet": r.get("content")}
-                for r in results
-            ],
-        }
-        return json.dumps(out, ensure_ascii=False)
+        # Cached for SEARCH_CACHE_TTL; identical concurrent queries share one Tavily request.
+        # Tavily applies the result limit, and the payload is trimmed to SEARCH_TOKEN_BUDGET.
+        resp = await cached_search(
+            ctx.context.tavily, args.query, timeout, max_results=5, include_answer=True
+        )
+        return json.dumps(compact_response(resp, args.query), ensure_ascii=False)
+    except CircuitOpenError as e:
+        print(f"❌ Tavily circuit open: {e}")
+        return json.dumps({"error": f"{e} Answer without web search for now.", "query": args.query})
+    except TimeoutError:
+        print("❌ Tavily search timed out")
+        return json.dumps({"error": "Tavily search timed out.", "query": args.query})
     except Exception as e:
         print(f"❌ Tavily search error: {e}")
         return json.dumps({"error": str(e), "query": args.query})
@@ -86,6 +102,9 @@ political_guardrail_agent = Agent(
     output_type=PoliticalCheck,
 )
 
+# Checker verdicts by output text; editing the checker's instructions invalidates them
+political_verdicts = VerdictCache("political_output", political_guardrail_agent.instructions)
+
 @output_guardrail
 async def political_output_guardrail(
     ctx: RunContextWrapper[AppContext],
@@ -95,14 +114,42 @@ async def political_output_guardrail(
     """Check if the agent output contains political content."""
     text = output.response
     print(f"🛡️ Checking for political content...")
-    
+
+    # Clear cases are decided locally; only ambiguous text costs an LLM call
+    verdict = political_filter.check(text)
+    if verdict.is_political is not None:
+        print(f"🛡️ Decided by {verdict.tier}: political={verdict.is_political}")
+        return GuardrailFunctionOutput(
+            output_info=PoliticalCheck(contains_political=verdict.is_political, reasoning=verdict.reason),
+            tripwire_triggered=verdict.is_political,
+        )
+
+    # Same (or near-identical) text already classified by the LLM checker
+    cached = political_verdicts.get(text)
+    if cached is not None:
+        final = PoliticalCheck(**cached)
+        print(f"🛡️ Cached verdict: political={final.contains_political}")
+        return GuardrailFunctionOutput(output_info=final, tripwire_triggered=final.contains_political)
+
+    timeout = time_left(ctx, GUARDRAIL_TIMEOUT)
+    if timeout <= 0:
+        # Same fail-safe as errors below: no budget left to run the checker
+        return GuardrailFunctionOutput(
+            output_info={"error": "Skipped: no time left in this request's budget"},
+            tripwire_triggered=False,
+        )
+
     try:
-        guard_result = await Runner.run(
-            political_guardrail_agent, 
-            f"Analyze this text for political content:\n\n{text}", 
-            context=ctx.context
+        guard_result = await asyncio.wait_for(
+            Runner.run(
+                political_guardrail_agent, 
+                f"Analyze this text for political content:\n\n{text}", 
+                context=ctx.context
+            ),
+            timeout,
         )
         final = guard_result.final_output
+        political_verdicts.put(text, final.model_dump())
         
         print(f"🛡️ Political content detected: {final.contains_political}")
         print(f"🛡️ Reasoning: {final.reasoning}")
@@ -125,12 +172,15 @@ def build_agent() -> Agent[AppContext]:
         instructions=(
             "You are a helpful research assistant. When users ask for current information, "
             "recent developments, or latest discoveries, ALWAYS use the tavily_search tool first. "
+            "For broad questions, call tavily_search_many once with several reformulations "
+            "instead of searching one phrasing at a time. For follow-ups on a topic you already "
+            "searched, use local_search, which only goes to the web when earlier results are not enough. "
             "Then provide a comprehensive response based on the search results.\n\n"
             "IMPORTANT: Avoid political topics, political figures, elections, government policies, "
             "or partisan content. Focus on science, technology, education, and general knowledge."
         ),
         model=gemini_model,
-        tools=[tavily_search],
+        tools=[tavily_search, tavily_search_many, local_search],
         output_type=AgentOutput,
         output_guardrails=[political_output_guardrail],
     )
@@ -138,11 +188,11 @@ def build_agent() -> Agent[AppContext]:
 async def main():
     print("🚀 Starting Web Researcher with Political Content Guardrail...")
     
-    api_key = os.environ.get("TAVILY_API_KEY")
-    if not api_key:
+    if not os.environ.get("TAVILY_API_KEY"):
         raise RuntimeError("TAVILY_API_KEY missing from environment variables")
     
-    ctx = AppContext(tavily=TavilyClient(api_key=api_key))
+    # One keep-alive Tavily client shared by every query in this process
+    ctx = AppContext(tavily=get_tavily_client())
     agent = build_agent()
 
     # Test queries
@@ -160,15 +210,28 @@ async def main():
         print('='*70)
         
         try:
-            result = await Runner.run(agent, query, context=ctx)
+            ctx.deadline = Deadline.after()  # fresh latency budget for each query, bounding the whole run
+            # Clear political content stops generation mid-stream; the full
+            # political_output_guardrail still checks the finished answer
+            async with within_deadline(ctx):
+                result = await run_streamed_guarded(
+                    agent, query, check=political_filter.blocks, context=ctx, run_config=deadline_run_config(ctx)
+                )
             print("✅ SUCCESS - Agent Response:")
             print(result.final_output.response)
             
+        except StreamTripwireTriggered as e:
+            print("🚫 BLOCKED by Political Content Guardrail while streaming!")
+            print(f"🚫 Reasoning: {e.reason}")
+        
         except OutputGuardrailTripwireTriggered as e:
             guard_info = e.guardrail_result.output.output_info
             print("🚫 BLOCKED by Political Content Guardrail!")
             print(f"🚫 Reasoning: {guard_info.reasoning}")
         
+        except TimeoutError:
+            print("⏱️ Request budget spent before the answer was ready")
+        
         except Exception as e:
             print(f"❌ Error: {str(e)}")
 
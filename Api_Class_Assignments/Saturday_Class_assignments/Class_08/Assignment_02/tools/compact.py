@@ -0,0 +1,65 @@
+# tools/compact.py
+import json
+from decouple import config
+
+# Prompt budget (estimated tokens) for one search tool result, and the longest snippet kept
+SEARCH_TOKEN_BUDGET = config("SEARCH_TOKEN_BUDGET", default=800, cast=int)
+SEARCH_SNIPPET_CHARS = config("SEARCH_SNIPPET_CHARS", default=400, cast=int)
+# Leftover budget smaller than this is not worth a squeezed-in snippet
+MIN_SNIPPET_CHARS = 80
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about four characters per token), good enough for budgeting."""
+    return len(text) // 4 + 1
+
+def trim(text: str, max_chars: int) -> str:
+    """Cuts text to max_chars at a word boundary, marking the cut with an ellipsis."""
+    if len(text) <= max_chars:
+        return text
+    cut = text[:max_chars].rsplit(" ", 1)[0]
+    return cut.rstrip(" ,.;:") + "…"
+
+def _cost(item: dict) -> int:
+    # +1 covers the separator between list items
+    return estimate_tokens(json.dumps(item, ensure_ascii=False)) + 1
+
+def compact_response(
+    resp: dict,
+    query: str,
+    budget: int = SEARCH_TOKEN_BUDGET,
+    snippet_chars: int = SEARCH_SNIPPET_CHARS,
+) -> dict:
+    """
+    Shrinks a Tavily response to fit a prompt budget.
+
+    Results are ranked by score with snippets trimmed to snippet_chars, then
+    kept in order while they fit. The last one may get a shorter snippet, and
+    `omitted` counts the results that did not fit.
+    """
+    slim = {"query": resp.get("query", query), "answer": resp.get("answer")}
+    if resp.get("cached_at"):
+        slim["cached_at"] = resp["cached_at"]
+    slim["results"] = []
+    used = _cost(slim)
+
+    ranked = sorted(resp.get("results", []), key=lambda r: r.get("score") or 0, reverse=True)
+    for n, r in enumerate(ranked):
+        score = r.get("score")
+        item = {
+            "title": r.get("title"),
+            "url": r.get("url"),
+            "snippet": trim(r.get("content") or "", snippet_chars),
+            "score": round(score, 3) if score is not None else None,
+        }
+        cost = _cost(item)
+        if used + cost > budget:
+            # Squeeze a shorter snippet into whatever is left of the budget
+            spare = (budget - used - _cost({**item, "snippet": ""}) - 1) * 4
+            if spare < MIN_SNIPPET_CHARS:
+                slim["omitted"] = len(ranked) - n
+                break
+            item["snippet"] = trim(item["snippet"], spare)
+            cost = _cost(item)
+        slim["results"].append(item)
+        used += cost
+    return slim
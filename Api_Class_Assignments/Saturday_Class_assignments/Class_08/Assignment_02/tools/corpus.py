@@ -0,0 +1,165 @@
+# tools/corpus.py
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from decouple import config
+from tools.merge import canonical_url
+
+# Where fetched results are indexed, and how old (seconds) a result may be to still be used
+CORPUS_PATH = config("CORPUS_PATH", default=".cache/corpus.sqlite3")
+CORPUS_MAX_AGE = config("CORPUS_MAX_AGE", default=86400.0, cast=float)
+# Local results are good enough when this many match this share of the query's terms
+CORPUS_MIN_RESULTS = config("CORPUS_MIN_RESULTS", default=2, cast=int)
+CORPUS_MIN_COVERAGE = config("CORPUS_MIN_COVERAGE", default=0.75, cast=float)
+
+# Words that carry no weight when ranking results
+STOP_WORDS = frozenset(
+    "a an and are about at be by can do does for from how i in is it me of on or "
+    "please show tell the to what whats when where which who why with".split()
+)
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+def _stem(word: str) -> str:
+    """Folds plain plurals ("atmospheres", "studies") onto their singular."""
+    if len(word) > 4 and word.endswith("ies"):
+        return word[:-3] + "y"
+    if len(word) > 3 and word.endswith("s") and not word.endswith(("ss", "us", "is")):
+        return word[:-1]
+    return word
+
+def tokenize(text: str) -> list[str]:
+    """Lowercased, plural-folded word tokens without stop words."""
+    return [_stem(w) for w in re.findall(r"\w+", text.casefold()) if w not in STOP_WORDS]
+
+class ResearchCorpus:
+    """
+    On-disk inverted index over every result Tavily has returned, ranked with BM25.
+
+    Documents are keyed by canonical URL, so a page fetched again replaces its
+    older copy and its fetch time.
+    """
+
+    def __init__(self, path: str = CORPUS_PATH):
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS docs (
+                id INTEGER PRIMARY KEY, key TEXT UNIQUE NOT NULL, url TEXT NOT NULL, title TEXT, snippet TEXT,
+                fetched_at REAL NOT NULL, length INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS postings (
+                term TEXT NOT NULL, doc_id INTEGER NOT NULL, tf INTEGER NOT NULL,
+                PRIMARY KEY (term, doc_id)
+            ) WITHOUT ROWID;
+            """
+        )
+        self._db.commit()
+
+    def add(self, results: list[dict], fetched_at: float | None = None) -> int:
+        """Indexes Tavily results (title, url, content); returns how many were stored."""
+        fetched_at = fetched_at or time.time()
+        stored = 0
+        with self._lock:
+            for r in results:
+                if not r.get("url"):
+                    continue
+                title, snippet = r.get("title") or "", r.get("content") or ""
+                terms = Counter(tokenize(f"{title} {snippet}"))
+                key = canonical_url(r["url"])
+                row = self._db.execute("SELECT id FROM docs WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    self._db.execute("DELETE FROM postings WHERE doc_id = ?", (row[0],))
+                    self._db.execute("DELETE FROM docs WHERE id = ?", (row[0],))
+                doc_id = self._db.execute(
+                    "INSERT INTO docs (key, url, title, snippet, fetched_at, length) VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, r["url"], title, snippet, fetched_at, sum(terms.values())),
+                ).lastrowid
+                self._db.executemany(
+                    "INSERT INTO postings (term, doc_id, tf) VALUES (?, ?, ?)",
+                    [(term, doc_id, tf) for term, tf in terms.items()],
+                )
+                stored += 1
+            self._db.commit()
+        return stored
+
+    def search(self, query: str, limit: int = 5, max_age: float = CORPUS_MAX_AGE) -> list[dict]:
+        """
+        Returns up to `limit` fresh documents ranked by BM25.
+
+        Each carries `score`, `coverage` (share of query terms it contains) and
+        `fetched_at`.
+        """
+        terms = set(tokenize(query))
+        if not terms:
+            return []
+        since = time.time() - max_age
+        with self._lock:
+            n_docs, avg_length = self._db.execute(
+                "SELECT COUNT(*), AVG(length) FROM docs WHERE fetched_at >= ?", (since,)
+            ).fetchone()
+            if not n_docs:
+                return []
+
+            scores: dict[int, float] = {}
+            matched: Counter[int] = Counter()
+            for term in terms:
+                rows = self._db.execute(
+                    "SELECT p.doc_id, p.tf, d.length FROM postings p JOIN docs d ON d.id = p.doc_id "
+                    "WHERE p.term = ? AND d.fetched_at >= ?",
+                    (term, since),
+                ).fetchall()
+                idf = math.log(1 + (n_docs - len(rows) + 0.5) / (len(rows) + 0.5))
+                for doc_id, tf, length in rows:
+                    norm = tf + K1 * (1 - B + B * length / (avg_length or 1))
+                    scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (K1 + 1) / norm
+                    matched[doc_id] += 1
+
+            ranked = sorted(scores, key=scores.get, reverse=True)[:limit]
+            docs = []
+            for doc_id in ranked:
+                url, title, snippet, fetched = self._db.execute(
+                    "SELECT url, title, snippet, fetched_at FROM docs WHERE id = ?", (doc_id,)
+                ).fetchone()
+                docs.append({
+                    "title": title,
+                    "url": url,
+                    "content": snippet,
+                    "score": scores[doc_id],
+                    "coverage": matched[doc_id] / len(terms),
+                    "fetched_at": datetime.fromtimestamp(fetched, timezone.utc).isoformat(timespec="seconds"),
+                })
+            return docs
+
+    def sufficient(self, docs: list[dict]) -> bool:
+        """True when local results cover the query well enough to skip the web."""
+        good = sum(1 for d in docs if d["coverage"] >= CORPUS_MIN_COVERAGE)
+        enough = good >= CORPUS_MIN_RESULTS
+        if enough:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return enough
+
+    def stats(self) -> dict:
+        """Returns document count and local hit/miss counters for monitoring."""
+        with self._lock:
+            (n_docs,) = self._db.execute("SELECT COUNT(*) FROM docs").fetchone()
+        return {"documents": n_docs, "hits": self.hits, "misses": self.misses}
+
+# Shared by every search in this process
+research_corpus = ResearchCorpus()
@@ -0,0 +1,51 @@
+# tools/merge.py
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Query parameters that only track the click and never change the page: any utm_* parameter,
+# and these exact names (a prefix match would also drop "reference", "refresh" or "refId")
+TRACKING_PREFIX = "utm_"
+TRACKING_PARAMS = frozenset({"fbclid", "gclid", "mc_cid", "mc_eid", "ref", "ref_src", "referrer"})
+
+def is_tracking_param(name: str) -> bool:
+    name = name.lower()
+    return name.startswith(TRACKING_PREFIX) or name in TRACKING_PARAMS
+
+def canonical_url(url: str) -> str:
+    """
+    Normalizes a URL so the same page found by different queries compares equal.
+
+    Treats http and https alike, lowercases the host, drops "www.", fragments,
+    tracking parameters and a trailing slash, and sorts the remaining query
+    parameters.
+    """
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower().removeprefix("www.")
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not is_tracking_param(k)
+    )
+    path = parts.path.rstrip("/") or "/"
+    scheme = parts.scheme.lower()
+    if scheme in ("", "http"):
+        scheme = "https"
+    return urlunsplit((scheme, host, path, urlencode(query), ""))
+
+def merge_results(responses: list[dict]) -> list[dict]:
+    """
+    Merges the result lists of several searches into one ranked list.
+
+    Duplicates (by canonical URL) keep their best-scoring copy; pages found by
+    more queries rank first among equal scores.
+    """
+    merged: dict[str, dict] = {}
+    found_by: dict[str, int] = {}
+    for resp in responses:
+        for r in resp.get("results", []):
+            if not r.get("url"):
+                continue
+            key = canonical_url(r["url"])
+            found_by[key] = found_by.get(key, 0) + 1
+            if key not in merged or (r.get("score") or 0) > (merged[key].get("score") or 0):
+                merged[key] = r
+    ranked = sorted(merged, key=lambda k: (merged[k].get("score") or 0, found_by[k]), reverse=True)
+    return [merged[k] for k in ranked]
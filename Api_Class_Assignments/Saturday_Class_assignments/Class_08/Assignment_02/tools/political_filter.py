@@ -0,0 +1,118 @@
+# tools/political_filter.py
+import math
+import re
+from dataclasses import dataclass
+from decouple import config
+
+# Classifier probabilities at or above which text is blocked, and below which it is allowed;
+# anything in between is escalated to the LLM checker
+POLITICAL_BLOCK_AT = config("POLITICAL_BLOCK_AT", default=0.9, cast=float)
+POLITICAL_ALLOW_BELOW = config("POLITICAL_ALLOW_BELOW", default=0.1, cast=float)
+
+# Tier 1: terms that make a text political on their own. Words with an everyday or math
+# meaning too ("trump card", "PPP" loans, a class election) are weighted in tier 2 instead
+POLITICAL_TERMS = (
+    # figures
+    "joe biden", "biden", "donald trump", "kamala harris", "barack obama", "obama",
+    "narendra modi", "imran khan", "shehbaz sharif", "nawaz sharif", "vladimir putin", "putin",
+    "xi jinping", "emmanuel macron", "rishi sunak", "keir starmer", "volodymyr zelensky", "zelensky",
+    # parties and movements
+    "democratic party", "republican party", "democrats", "republicans", "bjp",
+    "indian national congress", "pml-n", "labour party", "conservative party",
+    # offices, institutions and elections
+    "prime minister", "president of the united states", "white house", "senator", "congressman",
+    "congresswoman", "electoral", "polling station", "presidential", "campaign rally", "referendum",
+    "impeachment", "politics", "political", "politician", "partisan",
+)
+
+# Tier 2: per-word log-odds of a text being political; negative words point to safe topics.
+# On its own no single word reaches POLITICAL_BLOCK_AT, so an ambiguous word escalates
+WORD_WEIGHTS = {
+    "trump": 2.0, "modi": 2.0, "gop": 2.0, "tory": 2.0, "tories": 2.0, "ppp": 1.5, "pti": 1.5,
+    "election": 2.0, "elections": 2.0, "parliament": 2.0, "ballot": 1.0,
+    "government": 1.5, "minister": 2.0, "president": 1.5, "policy": 1.0, "policies": 1.0,
+    "vote": 1.5, "votes": 1.5, "voting": 1.5, "voter": 1.5, "voters": 1.5, "party": 0.8,
+    "legislation": 1.5, "senate": 2.0, "congress": 1.2, "cabinet": 1.0, "governor": 1.5,
+    "mayor": 1.2, "campaign": 0.8, "democracy": 1.5, "regime": 1.5, "sanctions": 1.0,
+    "protest": 1.0, "protests": 1.0, "immigration": 1.0, "diplomatic": 1.0, "law": 0.5,
+    "laws": 0.5, "tax": 0.6, "taxes": 0.6, "left-wing": 2.0, "right-wing": 2.0, "liberal": 1.0,
+    "conservative": 1.0, "opposition": 1.0, "coalition": 0.8, "lawmakers": 2.0, "state": 0.3,
+    "math": -1.5, "equation": -1.5, "solve": -1.0, "theorem": -1.5, "integral": -1.5,
+    "derivative": -1.5, "algebra": -1.5, "geometry": -1.5, "science": -1.0, "scientists": -1.0,
+    "research": -0.5, "telescope": -1.5, "planet": -1.0, "exoplanet": -1.5, "energy": -0.5,
+    "technology": -0.8, "algorithm": -1.2, "model": -0.3, "learning": -0.5, "physics": -1.5,
+    "chemistry": -1.5, "biology": -1.5, "recipe": -1.5, "software": -1.0,
+    "probability": -1.0, "calculate": -1.0, "percent": -0.5, "percentage": -0.5, "fraction": -1.0,
+}
+# Log-odds of a text with no evidence either way: mostly safe
+BIAS = -2.5
+
+@dataclass
+class Verdict:
+    """Local decision; is_political is None when the text must go to the LLM checker."""
+    tier: str
+    is_political: bool | None
+    reason: str
+
+class PoliticalFilter:
+    """
+    Tiered political-content check.
+
+    Tier 1 is one compiled pattern over unambiguous political terms. Tier 2
+    is a small log-odds word classifier. Only texts neither tier can decide
+    are escalated to the LLM checker (tier 3), which the caller runs.
+    """
+
+    def __init__(self, terms: tuple[str, ...] = POLITICAL_TERMS, weights: dict[str, float] = WORD_WEIGHTS):
+        alternatives = "|".join(re.escape(t) for t in sorted(terms, key=len, reverse=True))
+        self._matcher = re.compile(rf"\b(?:{alternatives})\b")
+        self._weights = weights
+        self.counts = {"matcher": 0, "classifier_allowed": 0, "classifier_blocked": 0, "escalated": 0}
+
+    def check(self, text: str) -> Verdict:
+        """Decides clear cases locally; returns is_political=None for ambiguous text."""
+        lowered = text.lower()
+        match = self._matcher.search(lowered)
+        if match:
+            self.counts["matcher"] += 1
+            return Verdict("matcher", True, f"Mentions '{match.group(0)}'.")
+
+        probability = self.probability(lowered)
+        if probability >= POLITICAL_BLOCK_AT:
+            self.counts["classifier_blocked"] += 1
+            return Verdict("classifier", True, f"Local classifier: political (p={probability:.2f}).")
+        if probability < POLITICAL_ALLOW_BELOW:
+            self.counts["classifier_allowed"] += 1
+            return Verdict("classifier", False, f"Local classifier: not political (p={probability:.2f}).")
+
+        self.counts["escalated"] += 1
+        return Verdict("llm", None, f"Ambiguous (p={probability:.2f}); escalated to the LLM checker.")
+
+    def blocks(self, text: str) -> str | None:
+        """
+        Returns a reason when the local tiers would block the text, else None.
+
+        Uncounted and never escalates, so it is cheap enough to run on partial
+        output while it streams in.
+        """
+        lowered = text.lower()
+        match = self._matcher.search(lowered)
+        if match:
+            return f"Mentions '{match.group(0)}'."
+        probability = self.probability(lowered)
+        if probability >= POLITICAL_BLOCK_AT:
+            return f"Local classifier: political (p={probability:.2f})."
+        return None
+
+    def probability(self, text: str) -> float:
+        """Estimated probability that the text is political; each distinct word counts once."""
+        words = set(re.findall(r"[a-z]+(?:-[a-z]+)?", text.lower()))
+        z = BIAS + sum(self._weights.get(w, 0.0) for w in words)
+        return 1 / (1 + math.exp(-z))
+
+    def stats(self) -> dict:
+        """Returns how many texts each tier decided, for monitoring."""
+        return dict(self.counts)
+
+# Shared by every guardrail check in this process
+political_filter = PoliticalFilter()
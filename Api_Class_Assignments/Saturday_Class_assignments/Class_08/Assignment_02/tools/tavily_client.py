@@ -0,0 +1,143 @@
+# tools/tavily_client.py
+import os
+from typing import Any
+
+from dotenv import load_dotenv
+from tools.http_pool import get_http_client
+
+load_dotenv()
+
+TAVILY_API_URL = os.environ.get("TAVILY_API_URL", "https://api.tavily.com")
+
+class PooledTavilyClient:
+    """
+    Async Tavily client that sends every search over the shared keep-alive pool.
+
+    Unlike TavilyClient (a fresh request per search) and AsyncTavilyClient (a
+    fresh httpx client per search), repeated searches reuse the same TLS
+    connection, so only the first one pays for the handshake.
+    """
+
+    def __init__(self, api_key: str, base_url: str = TAVILY_API_URL):
+        self.base_url = base_url.rstrip("/")
+        self._headers = {"Authorization": f"Bearer {api_key}"}
+
+    async def search(self, query: str, timeout: float = 10.0, **kwargs: Any) -> dict:
+        """Same parameters and JSON response as TavilyClient.search."""
+        response = await get_http_client().post(
+            f"{self.base_url}/search",
+            json={"query": query, **kwargs},
+            headers=self._headers,
+            timeout=timeout,
+        )
+        response.raise_for_status()
+        return response.json()
+
+_client: PooledTavilyClient | None = None
+
+def get_tavily_client() -> PooledTavilyClient:
+    """Returns the process-wide Tavily client, created on first use."""
+    global _client
+    if _client is None:
+        api_key = os.environ.get("TAVILY_API_KEY")
+        if not api_key:
+            raise RuntimeError("TAVILY_API_KEY missing")
+        _client = PooledTavilyClient(api_key)
+    return _client
+
+def tavily_of(ctx: Any) -> PooledTavilyClient:
+    """Returns the client injected into the run context (e.g. AppContext.tavily), else the shared one."""
+    context = getattr(ctx, "context", ctx)
+    client = context.get("tavily") if isinstance(context, dict) else getattr(context, "tavily", None)
+    return client or get_tavily_client()
+
+if __name__ == "__main__":
+    # Benchmark: sequential searches against a local TLS stub behind a proxy adding the given
+    # round-trip times (ms, default 0 20 50), TavilyClient per call vs PooledTavilyClient.
+    # Needs the openssl command for the stub's self-signed certificate
+    import asyncio
+    import json
+    import ssl
+    import subprocess
+    import sys
+    import tempfile
+    import threading
+    import time
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    from tavily import TavilyClient
+
+    searches = 50
+    workdir = tempfile.mkdtemp()
+    cert, key = os.path.join(workdir, "cert.pem"), os.path.join(workdir, "key.pem")
+    subprocess.run(
+        ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1", "-subj", "/CN=localhost",
+         "-addext", "subjectAltName=DNS:localhost", "-keyout", key, "-out", cert],
+        check=True, capture_output=True,
+    )
+    # Both clients trust the stub's certificate
+    os.environ["SSL_CERT_FILE"] = os.environ["REQUESTS_CA_BUNDLE"] = cert
+
+    class TavilyStub(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers["Content-Length"]))
+            body = json.dumps({"query": "q", "answer": None, "results": []}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    ThreadingHTTPServer.daemon_threads = True
+    server = ThreadingHTTPServer(("127.0.0.1", 0), TavilyStub)
+    tls = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+    tls.load_cert_chain(cert, key)
+    server.socket = tls.wrap_socket(server.socket, server_side=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    # The proxy delays every chunk by half the round trip, each way
+    rtt = 0.0
+
+    async def pipe(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while data := await reader.read(65536):
+                await asyncio.sleep(rtt / 2)
+                writer.write(data)
+                await writer.drain()
+        finally:
+            writer.close()
+
+    async def relay(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        upstream_reader, upstream_writer = await asyncio.open_connection("127.0.0.1", server.server_port)
+        await asyncio.gather(pipe(reader, upstream_writer), pipe(upstream_reader, writer), return_exceptions=True)
+
+    proxy_loop = asyncio.new_event_loop()
+    proxy = proxy_loop.run_until_complete(asyncio.start_server(relay, "127.0.0.1", 0))
+    threading.Thread(target=proxy_loop.run_forever, daemon=True).start()
+    url = f"https://localhost:{proxy.sockets[0].getsockname()[1]}"
+
+    def per_call() -> float:
+        started = time.perf_counter()
+        for i in range(searches):
+            TavilyClient(api_key="tvly-bench", api_base_url=url).search(f"query {i}")
+        return (time.perf_counter() - started) / searches
+
+    async def pooled() -> float:
+        client = PooledTavilyClient("tvly-bench", base_url=url)
+        await client.search("warm-up")
+        started = time.perf_counter()
+        for i in range(searches):
+            await client.search(f"query {i}")
+        return (time.perf_counter() - started) / searches
+
+    for rtt_ms in [float(arg) for arg in sys.argv[1:]] or [0.0, 20.0, 50.0]:
+        rtt = rtt_ms / 1000
+        fresh = per_call()
+        reused = asyncio.run(pooled())
+        print(f"rtt {rtt_ms:>3.0f} ms: TavilyClient per call {fresh * 1000:.1f} ms/search, pooled {reused * 1000:.1f} ms/search")
@@ -1,14 +1,41 @@
 # tools/tavily_tool_min.py
+import asyncio
 import json
 import os
-from typing import TypedDict
+from typing import Any, TypedDict
 
+import httpx
 from dotenv import load_dotenv
-from tavily import TavilyClient
-from agents import function_tool  # from openai-agents
+from agents import function_tool, RunContextWrapper  # from openai-agents
+from tools.singleflight import SingleFlight
+from tools.deadline import time_left
+from tools.circuit_breaker import CircuitBreaker, CircuitOpenError
+from tools.tavily_client import tavily_of
+from tools.search_cache import search_cache, search_key
+from tools.compact import compact_response
+from tools.merge import merge_results
+from tools.corpus import research_corpus
 
 load_dotenv()
 
+# Upper bound (seconds) for one Tavily search; shortened to the request's remaining budget
+TAVILY_TIMEOUT = float(os.environ.get("TAVILY_TIMEOUT", "10"))
+# Reformulations searched at the same time by tavily_search_many, and the most accepted per call
+TAVILY_MAX_CONCURRENCY = int(os.environ.get("TAVILY_MAX_CONCURRENCY", "4"))
+TAVILY_MAX_QUERIES = int(os.environ.get("TAVILY_MAX_QUERIES", "6"))
+
+# Concurrent identical searches (e.g. from several chat sessions) share one Tavily request
+search_flight = SingleFlight()
+def is_upstream_failure(error: Exception) -> bool:
+    """Transport errors, 429 and 5xx; any other 4xx (bad key, bad request) is not Tavily being down."""
+    if isinstance(error, httpx.HTTPStatusError):
+        status = error.response.status_code
+        return status == 429 or status >= 500
+    return isinstance(error, httpx.TransportError)
+
+# Fails fast (with retries and jittered backoff before that) while Tavily keeps erroring
+tavily_breaker = CircuitBreaker("tavily", failures=is_upstream_failure)
+
 class TavilyArgs(TypedDict):
     """Arguments for Tavily search."""
     query: str
@@ -19,45 +46,145 @@ class TavilyArgs(TypedDict):
 # Tavily's Python client supports `client.search("query")` and returns
 # JSON with fields like `answer`, `results`, etc. (see docs).  # docs ref
 
+async def cached_search(client: Any, query: str, timeout: float, **params: Any) -> dict:
+    """
+    Runs a Tavily search through the result cache.
+
+    Cached responses carry a `cached_at` timestamp; on a miss, identical
+    in-flight queries share one call and the fetched results are added to the
+    local research corpus. Raises CircuitOpenError or TimeoutError.
+    """
+    cached = search_cache.get(query, params)
+    if cached is not None:
+        return cached
+
+    async def attempt() -> dict:
+        try:
+            return await client.search(query, timeout=timeout, **params)
+        except httpx.TimeoutException as e:
+            # Cut short by the request deadline: ours, so the breaker neither counts nor retries it
+            if timeout < TAVILY_TIMEOUT:
+                raise TimeoutError("request budget spent") from e
+            raise
+
+    async def fetch() -> dict:
+        resp = await tavily_breaker.call(attempt)
+        search_cache.put(query, params, resp)
+        # Keep every fetched result for later local_search lookups
+        research_corpus.add(resp.get("results", []))
+        return resp
+
+    return await asyncio.wait_for(search_flight.do(search_key(query, params), fetch), timeout)
+
 @function_tool
-def tavily_search(args: TavilyArgs) -> str:
+async def tavily_search(ctx: RunContextWrapper[Any], args: TavilyArgs) -> str:
     """
     Run a web search with Tavily and return a compact JSON summary.
 
     Args:
       query: What to search for on the web.
-      max_results: Limit number of results to keep (default 5).
+      max_results: Number of results Tavily returns (default 5).
       include_answer: Ask Tavily to generate a direct answer when possible.
     """
-    print("Tools is used")
-    api_key = os.environ.get("TAVILY_API_KEY")
-    if not api_key:
-        raise RuntimeError("TAVILY_API_KEY missing")
-
-    client = TavilyClient(api_key=api_key)
+    # Process-wide pooled client (or the one injected via the run context)
+    client = tavily_of(ctx)
 
     # Tavily's client accepts a string (basic) or keyword params via **kwargs.
-    # We'll stay defensive and only forward what we declared.
+    # We'll stay defensive and only forward what we declared, so Tavily itself
+    # limits the results instead of us downloading and discarding the rest.
     q = args["query"]
     max_results = args.get("max_results") or 5
-    include_answer = args.get("include_answer")
-    resp = client.search(q)  # basic usage per quickstart
-
-    # Normalize to a compact shape that's easy for the model:
-    answer = resp.get("answer")
-    results = resp.get("results", [])[:max_results]
-    slim = {
-        "query": resp.get("query", q),
-        "answer": answer,
-        "results": [
-            {
-                "title": r.get("title"),
-                "url": r.get("url"),
-                "snippet": r.get("content"),
-                "score": r.get("score"),
-            }
-            for r in results
-        ],
-    }
+    include_answer = bool(args.get("include_answer"))
+    timeout = time_left(ctx, TAVILY_TIMEOUT)
+    if timeout <= 0:
+        return json.dumps({"error": "Skipped: no time left in this request's budget.", "query": q})
+
+    # Served from the result cache when fresh; the pooled client keeps the TLS connection warm
+    try:
+        resp = await cached_search(client, q, timeout, max_results=max_results, include_answer=include_answer)
+    except CircuitOpenError as e:
+        return json.dumps({"error": f"{e} Answer without web search for now.", "query": q})
+    except (TimeoutError, httpx.TimeoutException):
+        return json.dumps({"error": "Tavily search timed out.", "query": q})
+
+    # Ranked by score and trimmed to the prompt budget (SEARCH_TOKEN_BUDGET)
+    slim = compact_response(resp, q)
     # Ensure we always return a string (SDK expects str output for function tools)
     return json.dumps(slim, ensure_ascii=False)
+
+@function_tool
+async def tavily_search_many(ctx: RunContextWrapper[Any], queries: list[str], max_results: int = 5) -> str:
+    """
+    Run several web searches at once and return one merged, ranked JSON list.
+    Use this instead of calling tavily_search repeatedly for reformulations of one question.
+
+    Args:
+      queries: Different phrasings or sub-questions, e.g. ["exoplanet discoveries 2025", "JWST exoplanet atmosphere"].
+      max_results: Results Tavily returns per query (default 5).
+    """
+    client = tavily_of(ctx)
+
+    # Drop reformulations that normalize to the same search
+    unique: dict[str, str] = {}
+    for q in queries:
+        if q.strip():
+            unique.setdefault(search_key(q, {}), q.strip())
+    unique_queries = list(unique.values())[:TAVILY_MAX_QUERIES]
+    if not unique_queries:
+        return json.dumps({"error": "No queries were provided."})
+
+    timeout = time_left(ctx, TAVILY_TIMEOUT)
+    if timeout <= 0:
+        return json.dumps({"error": "Skipped: no time left in this request's budget.", "queries": unique_queries})
+
+    limit = asyncio.Semaphore(TAVILY_MAX_CONCURRENCY)
+
+    async def one(q: str) -> dict:
+        async with limit:
+            try:
+                return await cached_search(client, q, timeout, max_results=max_results, include_answer=False)
+            except CircuitOpenError as e:
+                return {"error": f"{e} Answer without web search for now."}
+            except (TimeoutError, httpx.TimeoutException):
+                return {"error": "Tavily search timed out."}
+
+    responses = await asyncio.gather(*(one(q) for q in unique_queries))
+    merged = {"query": " | ".join(unique_queries), "results": merge_results(responses)}
+    slim = compact_response(merged, merged["query"])
+    errors = {q: r["error"] for q, r in zip(unique_queries, responses) if "error" in r}
+    if errors:
+        slim["errors"] = errors
+    return json.dumps(slim, ensure_ascii=False)
+
+@function_tool
+async def local_search(ctx: RunContextWrapper[Any], query: str, max_results: int = 5) -> str:
+    """
+    Search previously fetched web results first, and the live web only when they fall short.
+    Prefer this over tavily_search for follow-up questions on a topic already researched.
+
+    Args:
+      query: What to search for.
+      max_results: Number of results to return (default 5).
+    """
+    docs = research_corpus.search(query, limit=max_results)
+    if research_corpus.sufficient(docs):
+        local = {
+            "query": query,
+            "answer": None,
+            # Age of the oldest result used, like `cached_at` for cached web searches
+            "cached_at": min(d["fetched_at"] for d in docs),
+            "results": docs,
+        }
+        return json.dumps({"source": "local", **compact_response(local, query)}, ensure_ascii=False)
+
+    # Not enough fresh local recall: search the web (which also grows the corpus)
+    timeout = time_left(ctx, TAVILY_TIMEOUT)
+    if timeout <= 0:
+        return json.dumps({"error": "Skipped: no time left in this request's budget.", "query": query})
+    try:
+        resp = await cached_search(tavily_of(ctx), query, timeout, max_results=max_results, include_answer=False)
+    except CircuitOpenError as e:
+        return json.dumps({"error": f"{e} Answer without web search for now.", "query": query})
+    except (TimeoutError, httpx.TimeoutException):
+        return json.dumps({"error": "Tavily search timed out.", "query": query})
+    return json.dumps({"source": "web", **compact_response(resp, query)}, ensure_ascii=False)
@@ -9,24 +9,17 @@ from agents import (
     RunContextWrapper,
     function_tool,
     set_tracing_disabled,
-    OpenAIChatCompletionsModel,
-    AsyncOpenAI,
 )
-from decouple import config
 from dataclasses import dataclass, field
 from typing import Any, Dict, List
+from my_config import get_model
 
 # --- Setup (No changes here) ---
 load_dotenv()
 set_tracing_disabled(True)
 
-key = config("GEMINI_API_KEY")
-base_url = config("GEMINI_BASE_URL")
-gemini_client = AsyncOpenAI(api_key=key, base_url=base_url)
-gemini_model = OpenAIChatCompletionsModel(
-    model="gemini-1.5-flash",  # Switched to a faster, more common model to help with rate limits
-    openai_client=gemini_client,
-)
+# Pooled, rate-limited client from my_config.py: calls queue client-side instead of hitting 429s
+gemini_model = get_model("gemini-1.5-flash")  # Switched to a faster, more common model to help with rate limits
 
 # --- Context (No changes here) ---
 @dataclass
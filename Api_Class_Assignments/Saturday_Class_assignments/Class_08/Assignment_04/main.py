@@ -1,9 +1,11 @@
 import asyncio
+import os
 from typing import Dict, Any
 from dataclasses import dataclass # Keep using dataclass as you said
 
 from decouple import config
 from dotenv import load_dotenv
+from tools.rule_packs import RulePackEngine
 
 # Import the specific utilities we now know are required
 from agents import (
@@ -33,6 +35,9 @@ except Exception as e:
     print(f"Could not set up the model. Please check your .env file. Error: {e}")
     exit()
 
+# Offensive-word packs in tools/rules/*.json; edits are picked up without a restart
+offensive_rules = RulePackEngine(os.path.join(os.path.dirname(os.path.abspath(__file__)), "tools", "rules"))
+
 # --- 2. DATA ---
 SIMULATED_ORDERS_DB = {
     "12345": {"status": "Shipped"},
@@ -102,8 +107,7 @@ async def main():
             break
 
         # Simple guardrail check
-        offensive_words = ["stupid", "useless", "terrible"]
-        if any(word in query.lower() for word in offensive_words):
+        if offensive_rules.match(query) is not None:
             print("🛡️ Guardrail triggered.")
             print("🤖 Assistant: Please be respectful. How can I help you?")
             continue
@@ -0,0 +1,89 @@
+# tools/search_cache.py
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from decouple import config
+
+# Where search results are persisted and how long (seconds) they count as fresh
+SEARCH_CACHE_PATH = config("SEARCH_CACHE_PATH", default=".cache/search.sqlite3")
+SEARCH_CACHE_TTL = config("SEARCH_CACHE_TTL", default=3600.0, cast=float)
+
+def normalize_query(query: str) -> str:
+    """
+    Normalizes a query so trivially different spellings share one entry.
+
+    Only case, punctuation and whitespace are folded: "Latest AI news?" and
+    "latest  ai news" share a key, but word order and question words are
+    kept, since "flights Paris to London" and "When was..." vs "Where was..."
+    ask for different results.
+    """
+    return " ".join(re.findall(r"\w+", query.casefold()))
+
+def search_key(query: str, params: dict) -> str:
+    """Cache key: the normalized query plus every parameter that changes the response."""
+    return json.dumps([normalize_query(query), params], sort_keys=True)
+
+class SearchCache:
+    """
+    Search key -> Tavily response, persisted in SQLite with a freshness TTL.
+
+    Shared across chat sessions and restarts, so repeat research turns skip
+    the paid network call entirely.
+    """
+
+    def __init__(self, path: str = SEARCH_CACHE_PATH, ttl: float = SEARCH_CACHE_TTL):
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS search (key TEXT PRIMARY KEY, response TEXT NOT NULL, cached_at REAL NOT NULL)"
+        )
+        self._db.commit()
+
+    def get(self, query: str, params: dict) -> dict | None:
+        """Returns the cached response with a `cached_at` timestamp, or None when missing or stale."""
+        key = search_key(query, params)
+        with self._lock:
+            row = self._db.execute("SELECT response, cached_at FROM search WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            if time.time() - row[1] > self.ttl:
+                self.expired += 1
+                return None
+            self.hits += 1
+
+        response = json.loads(row[0])
+        response["cached_at"] = datetime.fromtimestamp(row[1], timezone.utc).isoformat(timespec="seconds")
+        return response
+
+    def put(self, query: str, params: dict, response: dict) -> None:
+        """Stores a fresh response and drops entries that have gone stale."""
+        key = search_key(query, params)
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO search (key, response, cached_at) VALUES (?, ?, ?)",
+                (key, json.dumps(response, ensure_ascii=False), now),
+            )
+            self._db.execute("DELETE FROM search WHERE cached_at < ?", (now - self.ttl,))
+            self._db.commit()
+
+    def stats(self) -> dict:
+        """Returns hit/miss counters for monitoring."""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "expired": self.expired}
+
+# Shared by every search in this process
+search_cache = SearchCache()
@@ -0,0 +1,122 @@
+import os
+from collections import deque
+from typing import Iterable
+
+from decouple import config
+
+# Bundled gazetteer ("name<TAB>country"), or a GeoNames dump such as cities15000.txt
+CITY_GAZETTEER = config(
+    "CITY_GAZETTEER",
+    default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "cities.tsv"),
+)
+
+
+def load_city_names(country: str, path: str = CITY_GAZETTEER) -> set[str]:
+    """Reads every name and alternate name of the country's cities from the gazetteer."""
+    names = set()
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip() or line.startswith("#"):
+                continue
+            cols = line.rstrip("\n").split("\t")
+            if len(cols) >= 15:
+                # GeoNames: name, asciiname, alternatenames ... country code (8)
+                if cols[8] == country:
+                    names.update([cols[1], cols[2], *cols[3].split(",")])
+            elif cols[1] == country:
+                names.add(cols[0])
+    return {name for name in names if name.strip()}
+
+
+class CityMatcher:
+    """
+    Aho-Corasick automaton over city names, matched on word boundaries.
+
+    Built once; each search is a single left-to-right pass over the text, so
+    the cost grows with the text length, not with the number of names.
+    """
+
+    def __init__(self, names: Iterable[str]):
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        # Lengths of the names that end at each state (own plus via fail links)
+        self._out: list[tuple[int, ...]] = [()]
+        self.size = 0
+
+        for name in names:
+            key = " ".join(name.lower().split())
+            if key:
+                self._add(key)
+        self._link()
+
+    def _add(self, key: str) -> None:
+        state = 0
+        for ch in key:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+            state = nxt
+        if len(key) not in self._out[state]:
+            self._out[state] += (len(key),)
+            self.size += 1
+
+    def _link(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._out[nxt] += self._out[self._fail[nxt]]
+
+    def search(self, text: str) -> str | None:
+        """Returns the first city name found as whole words in the text, or None."""
+        text = " ".join(text.lower().split())
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for length in out[state]:
+                start = i - length + 1
+                if (start == 0 or not text[start - 1].isalnum()) and (
+                    i + 1 == len(text) or not text[i + 1].isalnum()
+                ):
+                    return text[start : i + 1]
+        return None
+
+
+if __name__ == "__main__":
+    # Benchmark: build and scan time at 10k and 100k synthetic names
+    import random
+    import string
+    import time
+
+    random.seed(7)
+    text = " ".join(random.choice(["the", "weather", "in", "karachi", "is", "sunny", "today"]) for _ in range(200))
+    for n in (10_000, 100_000):
+        names = {"".join(random.choices(string.ascii_lowercase, k=random.randint(5, 12))) for _ in range(n)}
+        started = time.perf_counter()
+        matcher = CityMatcher(names)
+        built = time.perf_counter() - started
+        started = time.perf_counter()
+        for _ in range(1000):
+            matcher.search(text)
+        scanned = (time.perf_counter() - started) / 1000
+        started = time.perf_counter()
+        for _ in range(10):
+            any(name in text for name in names)
+        naive = (time.perf_counter() - started) / 10
+        print(
+            f"{matcher.size:>7} names: build {built:.2f}s, scan {len(text)} chars {scanned * 1e6:.0f}µs "
+            f"(one substring scan per name: {naive * 1e6:.0f}µs)"
+        )
@@ -0,0 +1,88 @@
+import asyncio
+import functools
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable
+
+from decouple import config
+
+# How long (seconds) a guardrail verdict is reused, and how many verdicts are kept
+GUARDRAIL_MEMO_TTL = config("GUARDRAIL_MEMO_TTL", default=600.0, cast=float)
+GUARDRAIL_MEMO_SIZE = config("GUARDRAIL_MEMO_SIZE", default=1024, cast=int)
+
+
+def normalize_text(text: str) -> str:
+    """Lower-cased with whitespace collapsed, the same folding the city matcher applies."""
+    return " ".join(text.lower().split())
+
+
+def _digest(data: Any) -> str:
+    if isinstance(data, str):
+        data = normalize_text(data)
+    else:
+        data = json.dumps(data, sort_keys=True, default=str)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+class GuardrailMemo:
+    """
+    TTL cache of guardrail verdicts, shared across runs.
+
+    The SDK evaluates each guardrail once per Runner call, so the reuse
+    comes from later turns: a memoized guardrail seen again on the same
+    normalized input (a repeated question, a retry after a rejection, the
+    same answer text) returns the stored verdict instead of re-checking.
+    `key` picks the part of the data the guardrail actually looks at; the
+    verdict must depend on nothing else (not on the context or the agent).
+    Concurrent duplicates join the evaluation already in flight.
+    """
+
+    def __init__(self, ttl: float = GUARDRAIL_MEMO_TTL, max_size: int = GUARDRAIL_MEMO_SIZE):
+        self.ttl = ttl
+        self.max_size = max_size
+        self.evaluated = 0
+        self.skipped = 0
+        self._results: OrderedDict[tuple[str, str], tuple[asyncio.Future, float]] = OrderedDict()
+
+    def memoize(self, fn: Callable[..., Awaitable[Any]] | None = None, *, key: Callable[[Any], Any] | None = None):
+        """Decorator for a guardrail function (ctx, agent, data); apply it under @input_guardrail / @output_guardrail."""
+        if fn is None:
+            return functools.partial(self.memoize, key=key)
+        name = f"{fn.__module__}.{fn.__qualname__}"
+
+        @functools.wraps(fn)
+        async def wrapper(ctx, agent, data):
+            cache_key = (name, _digest(key(data) if key else data))
+            now = time.monotonic()
+            entry = self._results.get(cache_key)
+            if entry is not None and now - entry[1] <= self.ttl:
+                self.skipped += 1
+                self._results.move_to_end(cache_key)
+                # Shielded: this caller going away must not cancel the owner's evaluation
+                return await asyncio.shield(entry[0])
+
+            self.evaluated += 1
+            # Stored before awaiting so a concurrent duplicate joins this evaluation
+            task = asyncio.ensure_future(fn(ctx, agent, data))
+            self._results[cache_key] = (task, now)
+            while len(self._results) > self.max_size:
+                self._results.popitem(last=False)
+            try:
+                return await task
+            except BaseException:
+                # Errors and cancellations are not verdicts; the next call evaluates again
+                if self._results.get(cache_key, (None,))[0] is task:
+                    del self._results[cache_key]
+                raise
+
+        return wrapper
+
+    def stats(self) -> dict:
+        """Returns how many guardrail evaluations ran and how many were served from the memo."""
+        return {"evaluated": self.evaluated, "skipped": self.skipped, "entries": len(self._results)}
+
+
+# Shared by every guardrail in this process
+guardrail_memo = GuardrailMemo()
@@ -3,7 +3,6 @@ from agents import (
     Agent,
     HandoffInputData,
     RunContextWrapper,
-    Runner,
     RunConfig,
     TResponseInputItem,
     handoff,
@@ -20,6 +19,10 @@ from my_agents.weather_agent import weather_agent
 from my_agents.hotel_agent import hotel_agent
 from my_agents.flight_agent import flight_agent
 from my_config import gemini_model
+from stream_guard import run_streamed_guarded, StreamTripwireTriggered
+from city_matcher import CityMatcher, load_city_names
+from guardrail_memo import guardrail_memo
+from rate_limiter import scheduler
 from agents.extensions import handoff_filters
 
 import asyncio
@@ -74,28 +77,33 @@ triage_agent = Agent(
     if user ask for otherwise you can response yourself""",
 )
 
-indian_cities = ["delhi", "mumbai", "bangalore", "chennai", "kolkata", "hyderabad", "ahmedabad"]
-us_cities = ["new york", "los angeles", "chicago", "houston", "phoenix", "philadelphia", "san antonio"]
+# Built once from the city gazetteer (CITY_GAZETTEER); each check is one pass over the text
+indian_cities = CityMatcher(load_city_names("IN"))
+us_cities = CityMatcher(load_city_names("US"))
 
 def has_indian_city(text: str) -> bool:
-    return any(city in text.lower() for city in indian_cities)
+    return indian_cities.search(text) is not None
 
 def has_us_city(text: str) -> bool:
-    return any(city in text.lower() for city in us_cities)
+    return us_cities.search(text) is not None
 
+def latest_query(input_data: str | list[TResponseInputItem]) -> str:
+    if isinstance(input_data, list):
+        return input_data[-1].get('content', '') if input_data else ''
+    return input_data
+
+# Verdicts are reused across turns for the same (normalized) query or answer text
 @input_guardrail
+@guardrail_memo.memoize(key=latest_query)
 async def agent_input_guardrail(ctx: RunContextWrapper, agent: Agent, input_data: str | list[TResponseInputItem]) -> GuardrailFunctionOutput:
-    if isinstance(input_data, list):
-        query = input_data[-1].get('content', '') if input_data else ''
-    else:
-        query = input_data
-    triggered = has_indian_city(query)
+    triggered = has_indian_city(latest_query(input_data))
     return GuardrailFunctionOutput(
         tripwire_triggered=triggered,
         output_info={"reason": "Contains Indian city"} if triggered else {"reason": "OK"}
     )
 
 @output_guardrail
+@guardrail_memo.memoize
 async def agent_output_guardrail(ctx: RunContextWrapper, agent: Agent, output: str) -> GuardrailFunctionOutput:
     triggered = has_us_city(output)
     return GuardrailFunctionOutput(
@@ -123,26 +131,28 @@ async def main():
     while True:
         user_prompt = input("enter your query : ")
         if user_prompt == "exit":
+            print(f"guardrails: {guardrail_memo.stats()}")
+            print(f"model calls: {scheduler.stats()}")
             break
 
         input_data.append({"role": "user", "content": user_prompt})
 
         try:
-            result = await Runner.run(
+            # Run-level output guardrail, checked while the answer streams in:
+            # generation is cancelled as soon as a US city shows up
+            result = await run_streamed_guarded(
                 start_agent,
-                input=input_data,
+                input_data,
+                check=lambda text: "Contains US city" if has_us_city(text) else None,
                 run_config=RunConfig(model=gemini_model),
                 context=user,
             )
             start_agent = result.last_agent
             input_data = result.to_input_list()
-
-            # Run-level output guardrail (manual)
-            final_output = result.final_output
-            if has_us_city(final_output):
-                print("❌ No output due to run-level output guardrail")
-            else:
-                print(final_output)
+            print(result.final_output)
+        except StreamTripwireTriggered:
+            print("❌ No output due to run-level output guardrail")
+            input_data.pop()
         except InputGuardrailTripwireTriggered:
             print("❌ Reject query")
             # Reset input_data to previous if needed, but for simplicity, remove the last input
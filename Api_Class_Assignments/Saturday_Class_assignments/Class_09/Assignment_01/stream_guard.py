@@ -0,0 +1,54 @@
+from typing import Any, Callable
+
+from agents import Agent, Runner, RunResultStreaming
+from decouple import config
+from openai.types.responses import ResponseTextDeltaEvent
+
+# Re-check the accumulated output after at least this many new characters
+STREAM_CHECK_CHARS = config("STREAM_CHECK_CHARS", default=40, cast=int)
+
+
+class StreamTripwireTriggered(Exception):
+    """Raised when a streaming guardrail trips; generation has already been cancelled."""
+
+    def __init__(self, reason: str, partial_output: str):
+        self.reason = reason
+        self.partial_output = partial_output
+        super().__init__(reason)
+
+
+async def run_streamed_guarded(
+    agent: Agent[Any],
+    input: Any,
+    check: Callable[[str], str | None],
+    check_every: int = STREAM_CHECK_CHARS,
+    **run_kwargs: Any,
+) -> RunResultStreaming:
+    """
+    Runs the agent with Runner.run_streamed and checks the output while it is generated.
+
+    `check` gets all text streamed so far and returns a reason to block, or
+    None. When it trips, the run is cancelled at once and
+    StreamTripwireTriggered is raised, so a blocked answer stops costing
+    tokens as soon as the offending text appears. Agent guardrails still run
+    on the final output as usual.
+    """
+    result = Runner.run_streamed(agent, input, **run_kwargs)
+    text = ""
+    checked = 0
+    async for event in result.stream_events():
+        if event.type != "raw_response_event" or not isinstance(event.data, ResponseTextDeltaEvent):
+            continue
+        text += event.data.delta
+        if len(text) - checked >= check_every:
+            checked = len(text)
+            reason = check(text)
+            if reason:
+                result.cancel()
+                raise StreamTripwireTriggered(reason, text)
+
+    # The tail after the last periodic check
+    reason = check(text) if len(text) > checked else None
+    if reason:
+        raise StreamTripwireTriggered(reason, text)
+    return result
@@ -0,0 +1,146 @@
+# faq_index.py
+import json
+import math
+import os
+import re
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from decouple import config
+
+# FAQ file: [{"question": ..., "answer": ..., "alternates": [...]}, ...]
+FAQ_PATH = config(
+    "FAQ_PATH",
+    default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "faqs.json"),
+)
+# Below this similarity the question goes to the LLM instead
+FAQ_MIN_SIMILARITY = config("FAQ_MIN_SIMILARITY", default=0.6, cast=float)
+
+# Contractions and shorthand the users type instead of the stored wording
+_EXPANSIONS = {
+    "whats": "what is", "whos": "who is", "wheres": "where is", "hows": "how is", "youre": "you are",
+    "ur": "your", "u": "you",
+}
+# Words that do not change what is being asked. Question words, negations and person pronouns
+# are not among them: "What is my name?" is not "What is your name?"
+_FILLER = frozenset(
+    "a an the is are am was were be been do does did can could would will should shall may might "
+    "it its to of for in on at with please tell".split()
+)
+
+def normalize(text: str) -> list[str]:
+    """Lower-cased word tokens with apostrophes and common contractions folded."""
+    words = re.findall(r"\w+", text.casefold().replace("'", "").replace("’", ""))
+    return " ".join(_EXPANSIONS.get(w, w) for w in words).split()
+
+def _terms(text: str) -> Counter[str]:
+    """Word unigrams and bigrams plus character trigrams (so typos still overlap)."""
+    words = normalize(text)
+    terms = Counter(words)
+    terms.update(f"{a} {b}" for a, b in zip(words, words[1:]))
+    for word in words:
+        padded = f"#{word}#"
+        terms.update(f"#{padded[i:i + 3]}" for i in range(len(padded) - 2))
+    return terms
+
+def content_words(text: str) -> frozenset[str]:
+    return frozenset(w for w in normalize(text) if w not in _FILLER)
+
+def _close(a: str, b: str) -> bool:
+    """Equal, or one typo apart (substitution, insertion, deletion, adjacent swap) for words of 4+ letters."""
+    if a == b:
+        return True
+    if min(len(a), len(b)) < 4 or abs(len(a) - len(b)) > 1:
+        return False
+    i = 0
+    while i < min(len(a), len(b)) and a[i] == b[i]:
+        i += 1
+    if len(a) == len(b):
+        return a[i + 1:] == b[i + 1:] or (a[i] == b[i + 1] and a[i + 1] == b[i] and a[i + 2:] == b[i + 2:])
+    longer, shorter = (a, b) if len(a) > len(b) else (b, a)
+    return longer[i + 1:] == shorter[i:]
+
+def _covers(words: frozenset[str], other: frozenset[str]) -> bool:
+    return all(any(_close(w, o) for o in other) for w in words)
+
+@dataclass(frozen=True)
+class FaqMatch:
+    question: str
+    answer: str
+    score: float
+
+class FaqIndex:
+    """
+    TF-IDF index over FAQ questions (and their alternate phrasings).
+
+    Lookups walk an inverted index, so the cost grows with the postings of
+    the query's terms rather than with the number of entries; terms found
+    in most entries carry almost no weight and are not indexed. A match
+    also needs the same content words as the stored phrasing (up to a
+    typo each way): "Who created Python?" shares most of its text with
+    "Who created you?" but asks something else.
+    """
+
+    def __init__(self, entries: list[dict], min_similarity: float = FAQ_MIN_SIMILARITY):
+        self.entries = entries
+        self.min_similarity = min_similarity
+        self.hits = 0
+        self.fallbacks = 0
+        self._docs: list[tuple[str, str]] = []
+        self._content: list[frozenset[str]] = []
+        documents: list[Counter[str]] = []
+        for entry in entries:
+            for phrasing in [entry["question"], *entry.get("alternates", [])]:
+                self._docs.append((entry["question"], entry["answer"]))
+                self._content.append(content_words(phrasing))
+                documents.append(_terms(phrasing))
+
+        n = len(documents)
+        df = Counter(term for terms in documents for term in terms)
+        self._idf = {term: math.log((1 + n) / (1 + count)) + 1 for term, count in df.items()}
+        self._unseen_idf = math.log(1 + n) + 1
+        max_df = max(50, n // 2)
+        self._postings: dict[str, list[tuple[int, float]]] = defaultdict(list)
+        for doc, terms in enumerate(documents):
+            vector = self._vector(terms)
+            for term, weight in vector.items():
+                if df[term] <= max_df:
+                    self._postings[term].append((doc, weight))
+
+    @classmethod
+    def from_file(cls, path: str = FAQ_PATH, **kwargs) -> "FaqIndex":
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f), **kwargs)
+
+    def _vector(self, terms: Counter[str]) -> dict[str, float]:
+        # Unseen terms weigh like the rarest ones, so extra words dilute the match
+        weights = {t: (1 + math.log(c)) * self._idf.get(t, self._unseen_idf) for t, c in terms.items()}
+        norm = math.sqrt(sum(w * w for w in weights.values())) or 1.0
+        return {t: w / norm for t, w in weights.items()}
+
+    def match(self, question: str) -> FaqMatch | None:
+        """Returns the closest FAQ when it is similar enough to answer directly, else None."""
+        scores: dict[int, float] = defaultdict(float)
+        for term, weight in self._vector(_terms(question)).items():
+            for doc, doc_weight in self._postings.get(term, ()):
+                scores[doc] += weight * doc_weight
+
+        words = content_words(question)
+        for doc, score in sorted(scores.items(), key=lambda item: item[1], reverse=True):
+            if score < self.min_similarity:
+                break
+            if _covers(words, self._content[doc]) and _covers(self._content[doc], words):
+                self.hits += 1
+                question, answer = self._docs[doc]
+                return FaqMatch(question, answer, round(score, 3))
+        self.fallbacks += 1
+        return None
+
+    def render(self) -> str:
+        """The FAQs as a numbered Q&A list, for the fallback agent's instructions."""
+        return "\n\n".join(
+            f"{n}. **{entry['question']}**  \n   {entry['answer']}" for n, entry in enumerate(self.entries, 1)
+        )
+
+    def stats(self) -> dict:
+        """Returns how many questions were answered from the index vs sent to the LLM."""
+        return {"entries": len(self._docs), "hits": self.hits, "fallbacks": self.fallbacks}
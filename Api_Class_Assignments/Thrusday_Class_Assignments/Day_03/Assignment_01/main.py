@@ -2,6 +2,7 @@ from agents import Agent, Runner, AsyncOpenAI, OpenAIChatCompletionsModel, set_t
 import chainlit as cl
 from dotenv import load_dotenv
 from decouple import config
+from faq_index import FaqIndex
 
 load_dotenv()
 set_tracing_disabled(True)
@@ -16,26 +17,16 @@ gemini_model = OpenAIChatCompletionsModel(
     openai_client=gemini_client,
 )
 
-# Define the FAQ Agent
+# Questions close enough to a stored FAQ (data/faqs.json, or FAQ_PATH) are answered without the LLM
+faq_index = FaqIndex.from_file()
+
+# Define the FAQ Agent; it knows the same FAQs as the index, for the questions the index does not match
 faq_agent = Agent(
     name="FAQBot",
-    instructions="""
+    instructions=f"""
 You are a helpful FAQ chatbot. Answer the following questions clearly and concisely:
 
-1. **What is your name?**  
-   My name is FAQBot, your friendly assistant!
-
-2. **What can you do?**  
-   I can answer common questions about myself and provide helpful information.
-
-3. **Who created you?**  
-   I was created by a student using the OpenAI Agents SDK and Chainlit.
-
-4. **Where are you from?**  
-   I'm a digital assistant, so I exist in the cloud, ready to help!
-
-5. **How can I contact support?**  
-   For support, please reach out to the developer who created me.
+{faq_index.render()}
 
 For any other questions, respond politely that you can only answer predefined FAQs.
 """,
@@ -63,11 +54,13 @@ async def main(message: cl.Message):
     message_history = cl.user_session.get("message_history")
     message_history.append({"role": "user", "content": user_input})
 
-    # Run the agent with the user input
-    result = Runner.run_sync(faq_agent, user_input)
-
-    # Get the agent's response
-    response = result.final_output
+    # Answer from the FAQ index; only unmatched questions run the agent
+    match = faq_index.match(user_input)
+    if match is not None:
+        response = match.answer
+    else:
+        result = await Runner.run(faq_agent, user_input)
+        response = result.final_output
 
     # Update message history with the agent's response
     message_history.append({"role": "assistant", "content": response})
@@ -0,0 +1,54 @@
+import pytest
+
+from faq_index import FaqIndex
+
+
+@pytest.fixture(scope="module")
+def index():
+    return FaqIndex.from_file()
+
+
+@pytest.mark.parametrize(
+    "question, expected",
+    [
+        ("What is your name?", "What is your name?"),
+        ("whats ur name", "What is your name?"),
+        ("Whats your naem?", "What is your name?"),
+        ("How can you help me?", "What can you do?"),
+        ("who built you", "Who created you?"),
+        ("Where are u located?", "Where are you from?"),
+        ("how do i contact support", "How can I contact support?"),
+    ],
+)
+def test_matches_rephrased_faq(index, question, expected):
+    match = index.match(question)
+    assert match is not None
+    assert match.question == expected
+
+
+@pytest.mark.parametrize(
+    "question",
+    [
+        "Can you help me?",
+        "What can you not do?",
+        "How do I get help with my taxes?",
+        "Who created Python?",
+        "What is your age?",
+        "How can I contact the police?",
+        "How can I contact my bank?",
+        "Who are you voting for?",
+        "What is the weather today?",
+        "What is my name?",
+        "Who created me?",
+        "What can I do?",
+    ],
+)
+def test_off_topic_question_goes_to_the_llm(index, question):
+    assert index.match(question) is None
+
+
+def test_render_lists_every_faq(index):
+    rendered = index.render()
+    for entry in index.entries:
+        assert entry["question"] in rendered
+        assert entry["answer"] in rendered
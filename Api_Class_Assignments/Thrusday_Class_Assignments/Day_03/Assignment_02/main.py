@@ -2,6 +2,7 @@ from agents import Agent, Runner, AsyncOpenAI, OpenAIChatCompletionsModel, set_t
 import chainlit as cl
 from dotenv import load_dotenv
 from decouple import config
+from model_router import RoutedModel
 # Load environment variables (OPENAI_API_KEY)
 load_dotenv()
 set_tracing_disabled(True)
@@ -16,6 +17,13 @@ gemini_model = OpenAIChatCompletionsModel(
     openai_client=gemini_client,
 )
 
+# Cheaper tier for simple turns; RoutedModel picks per turn and escalates to gemini_model on failure
+gemini_fast_model = OpenAIChatCompletionsModel(
+    model=config("GEMINI_FAST_MODEL", default="gemini-2.5-flash"),
+    openai_client=gemini_client,
+)
+routed_model = RoutedModel(fast=gemini_fast_model, strong=gemini_model)
+
 # Define the math function as a tool
 @function_tool
 def add(a: float, b: float) -> float:
@@ -26,7 +34,7 @@ def add(a: float, b: float) -> float:
 math_agent = Agent(
     name="MathBot",
     instructions="You are a helpful math assistant. Use the provided tools to perform calculations when needed.",
-    model=gemini_model,
+    model=routed_model,
     tools=[add]
 )
 
@@ -0,0 +1,252 @@
+# gazetteer.py
+import hashlib
+import mmap
+import os
+import struct
+import threading
+from dataclasses import dataclass
+from decouple import config
+from geocode_cache import normalize_city
+
+# Source gazetteer: the bundled extract, or a GeoNames dump such as cities15000.txt
+GAZETTEER_SOURCE = config(
+    "GAZETTEER_SOURCE",
+    default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "cities.tsv"),
+)
+GAZETTEER_INDEX = config("GAZETTEER_INDEX", default=".cache/gazetteer.idx")
+# Typos are only corrected for names at least this long
+GAZETTEER_MIN_FUZZY_LENGTH = config("GAZETTEER_MIN_FUZZY_LENGTH", default=4, cast=int)
+
+# The header records a digest of the source, so an edited or replaced source is always rebuilt
+_MAGIC = b"GAZ2"
+_HEADER = struct.Struct("<4s32sII")
+_OFFSET = struct.Struct("<I")
+
+@dataclass(frozen=True)
+class Place:
+    name: str
+    country: str
+    lat: float
+    lon: float
+    population: int
+
+def _read_source(path: str):
+    """Yields (names, Place) from a GeoNames dump or the bundled compact TSV."""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip() or line.startswith("#"):
+                continue
+            cols = line.rstrip("\n").split("\t")
+            if len(cols) >= 15:
+                # GeoNames: name, asciiname, alternatenames, lat, lon ... country (8) ... population (14)
+                names = [cols[1], cols[2], *cols[3].split(",")]
+                place = Place(cols[1], cols[8], float(cols[4]), float(cols[5]), int(cols[14] or 0))
+            else:
+                # Bundled: name, alternatenames, lat, lon, country, population
+                names = [cols[0], *cols[1].split(",")]
+                place = Place(cols[0], cols[4], float(cols[2]), float(cols[3]), int(cols[5] or 0))
+            yield names, place
+
+def _source_digest(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").digest()
+
+def _index_digest(index_path: str) -> bytes | None:
+    """The source digest recorded in an index file, or None if it is missing or from another format."""
+    try:
+        with open(index_path, "rb") as f:
+            header = f.read(_HEADER.size)
+    except FileNotFoundError:
+        return None
+    if len(header) < _HEADER.size:
+        return None
+    magic, digest, _, _ = _HEADER.unpack(header)
+    return digest if magic == _MAGIC else None
+
+def _deletes(key: str) -> set[str]:
+    """All variants of the key with one character removed."""
+    return {key[:i] + key[i + 1:] for i in range(len(key))}
+
+def build_index(source: str = GAZETTEER_SOURCE, index_path: str = GAZETTEER_INDEX) -> None:
+    """
+    Compiles the source gazetteer into a sorted, memory-mappable index file.
+
+    Layout: header (with the source's digest), place offsets, delete offsets, then newline-terminated
+    records. Places are "key\\tname\\tcountry\\tlat\\tlon\\tpopulation" sorted by key;
+    deletes are "variant\\tplace_number" sorted by variant, for one-edit typo lookup.
+    """
+    digest = _source_digest(source)
+    places: dict[str, Place] = {}
+    for names, place in _read_source(source):
+        for name in names:
+            key = normalize_city(name)
+            if not key:
+                continue
+            # When several places share a name, keep the most populous one
+            if key not in places or places[key].population < place.population:
+                places[key] = place
+
+    keys = sorted(places)
+    deletes = sorted((variant, i) for i, key in enumerate(keys) for variant in _deletes(key))
+
+    records = [
+        f"{key}\t{p.name}\t{p.country}\t{p.lat}\t{p.lon}\t{p.population}\n".encode("utf-8")
+        for key, p in ((key, places[key]) for key in keys)
+    ]
+    records += [f"{variant}\t{i}\n".encode("utf-8") for variant, i in deletes]
+
+    offset = _HEADER.size + _OFFSET.size * len(records)
+    offsets = []
+    for record in records:
+        offsets.append(offset)
+        offset += len(record)
+
+    directory = os.path.dirname(index_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = index_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(_MAGIC, digest, len(keys), len(deletes)))
+        f.write(b"".join(_OFFSET.pack(o) for o in offsets))
+        f.writelines(records)
+    os.replace(tmp_path, index_path)
+
+def edit_distance(a: str, b: str) -> int:
+    """Damerau-Levenshtein (optimal string alignment) distance."""
+    prev2, prev = None, list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        cur = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                cur[j] = min(cur[j], prev2[j - 2] + 1)
+        prev2, prev = prev, cur
+    return prev[-1]
+
+class Gazetteer:
+    """
+    Offline city resolver over a memory-mapped index.
+
+    Supports exact names and aliases, and one-edit typo suggestions via a
+    precomputed delete index, all with binary searches.
+    """
+
+    def __init__(self, source: str = GAZETTEER_SOURCE, index_path: str = GAZETTEER_INDEX):
+        self.source = source
+        self.index_path = index_path
+        self.hits = 0
+        self.corrections = 0
+        self.misses = 0
+        self._mm: mmap.mmap | None = None
+        self._lock = threading.Lock()
+
+    def resolve(self, city: str) -> Place | None:
+        """Returns the place for an exact name or alias, or None."""
+        key = normalize_city(city)
+        if not key or not self._open():
+            return None
+
+        i = self._find(key)
+        if i is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return self._place(i)
+
+    def correct(self, city: str, limit: int = 3) -> list[Place]:
+        """
+        Returns places one edit away from the name, most populous first.
+
+        Only for suggestions once the name is known not to exist: a real
+        city one edit from a bigger one (Vienne, Sidney) must not be replaced.
+        """
+        key = normalize_city(city)
+        if len(key) < GAZETTEER_MIN_FUZZY_LENGTH or not self._open():
+            return []
+
+        places = {}
+        for candidate in self._typo_candidates(key):
+            if edit_distance(key, self._key(candidate)) <= 1:
+                place = self._place(candidate)
+                places[(place.name, place.country)] = place
+        ranked = sorted(places.values(), key=lambda p: -p.population)[:limit]
+        if ranked:
+            self.corrections += 1
+        return ranked
+
+    def stats(self) -> dict:
+        """Returns hit/miss counters for monitoring."""
+        return {"hits": self.hits, "corrections": self.corrections, "misses": self.misses}
+
+    # --- index access ---
+
+    def _open(self) -> bool:
+        if self._mm is not None:
+            return True
+        with self._lock:
+            if self._mm is not None:
+                return True
+            if not os.path.exists(self.source):
+                return False
+            # Compared by content, not mtime: a copied or restored source can be older than a stale index
+            digest = _source_digest(self.source)
+            if _index_digest(self.index_path) != digest:
+                build_index(self.source, self.index_path)
+            with open(self.index_path, "rb") as f:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, built_from, self._n_places, self._n_deletes = _HEADER.unpack_from(mm, 0)
+            if magic != _MAGIC or built_from != digest:
+                mm.close()
+                return False
+            self._mm = mm
+            return True
+
+    def _record(self, n: int) -> list[str]:
+        start = _OFFSET.unpack_from(self._mm, _HEADER.size + _OFFSET.size * n)[0]
+        end = self._mm.find(b"\n", start)
+        return self._mm[start:end].decode("utf-8").split("\t")
+
+    def _key(self, i: int) -> str:
+        return self._record(i)[0]
+
+    def _place(self, i: int) -> Place:
+        _, name, country, lat, lon, population = self._record(i)
+        return Place(name, country, float(lat), float(lon), int(population))
+
+    def _lower_bound(self, key: str, lo: int, hi: int, base: int = 0) -> int:
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._record(base + mid)[0] < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _find(self, key: str) -> int | None:
+        i = self._lower_bound(key, 0, self._n_places)
+        if i < self._n_places and self._key(i) == key:
+            return i
+        return None
+
+    def _typo_candidates(self, key: str) -> set[int]:
+        base = self._n_places
+        candidates = set()
+        # An insertion in the query matches a place key directly...
+        for variant in _deletes(key):
+            i = self._find(variant)
+            if i is not None:
+                candidates.add(i)
+        # ...and deletions, substitutions and transpositions meet in the delete index
+        for variant in {key} | _deletes(key):
+            j = self._lower_bound(variant, 0, self._n_deletes, base)
+            while j < self._n_deletes:
+                record = self._record(base + j)
+                if record[0] != variant:
+                    break
+                candidates.add(int(record[1]))
+                j += 1
+        return candidates
+
+# Shared by every weather lookup in this process
+gazetteer = Gazetteer()
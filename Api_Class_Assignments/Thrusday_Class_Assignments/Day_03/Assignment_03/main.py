@@ -3,6 +3,7 @@ import chainlit as cl
 from dotenv import load_dotenv
 from decouple import config
 from weather_api import get_weather
+from deadline import RequestContext, deadline_run_config, within_deadline
 
 # Load environment variables (GEMINI_API_KEY, GEMINI_BASE_URL, WEATHER_API_KEY)
 load_dotenv()
@@ -42,8 +43,17 @@ async def main(message: cl.Message):
     message_history = cl.user_session.get("message_history")
     message_history.append({"role": "user", "content": user_input})
 
-    result = Runner.run_sync(weather_agent, user_input)
-    response = result.final_output
+    # Start this request's latency budget; tools read it from the run context,
+    # model calls get what is left of it, and the whole run stops when it is spent
+    context = RequestContext()
+    try:
+        async with within_deadline(context):
+            result = await Runner.run(
+                weather_agent, user_input, context=context, run_config=deadline_run_config(context)
+            )
+        response = result.final_output
+    except TimeoutError:
+        response = "Sorry, that took too long to answer. Please try again."
     message_history.append({"role": "assistant", "content": response})
 
     msg = cl.Message(content=response)
@@ -0,0 +1,100 @@
+# weather_cache.py
+import asyncio
+import time
+from typing import Awaitable, Callable
+from decouple import config
+
+# Current conditions are fresh for WEATHER_CACHE_TTL seconds, then served stale
+# (while a background refresh runs) for up to WEATHER_CACHE_MAX_STALE more seconds
+WEATHER_CACHE_TTL = config("WEATHER_CACHE_TTL", default=600, cast=float)
+WEATHER_CACHE_MAX_STALE = config("WEATHER_CACHE_MAX_STALE", default=1800, cast=float)
+WEATHER_CACHE_SIZE = config("WEATHER_CACHE_SIZE", default=2048, cast=int)
+
+Fetcher = Callable[[], Awaitable[dict | None]]
+
+class WeatherCache:
+    """
+    In-memory cache of current-weather payloads keyed by coordinates.
+
+    Expired entries are returned immediately while a single background task
+    refreshes them (stale-while-revalidate).
+    """
+
+    def __init__(
+        self,
+        ttl: float = WEATHER_CACHE_TTL,
+        max_stale: float = WEATHER_CACHE_MAX_STALE,
+        max_size: int = WEATHER_CACHE_SIZE,
+    ):
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self.max_size = max_size
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refresh_errors = 0
+        self._entries: dict[tuple[float, float], tuple[float, dict]] = {}
+        self._refreshing: dict[tuple[float, float], asyncio.Task] = {}
+
+    @staticmethod
+    def key(lat: float, lon: float) -> tuple[float, float]:
+        # ~100 m precision: nearby lookups for the same city share an entry
+        return round(lat, 3), round(lon, 3)
+
+    async def get(self, lat: float, lon: float, fetch: Fetcher) -> dict | None:
+        """Returns the cached payload, or awaits `fetch` on a miss and caches its result."""
+        key = self.key(lat, lon)
+        entry = self._entries.get(key)
+        if entry is not None:
+            age = time.monotonic() - entry[0]
+            if age < self.ttl:
+                self.hits += 1
+                return entry[1]
+            if age < self.ttl + self.max_stale:
+                self.stale_hits += 1
+                self._refresh_in_background(key, fetch)
+                return entry[1]
+
+        self.misses += 1
+        data = await fetch()
+        if data is not None:
+            self._store(key, data)
+        return data
+
+    def stats(self) -> dict:
+        """Returns hit/miss counters for monitoring."""
+        return {
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "refresh_errors": self.refresh_errors,
+            "entries": len(self._entries),
+            "refreshing": len(self._refreshing),
+        }
+
+    def _store(self, key: tuple[float, float], data: dict) -> None:
+        self._entries.pop(key, None)
+        self._entries[key] = (time.monotonic(), data)
+        while len(self._entries) > self.max_size:
+            # Dicts keep insertion order, so the first key is the oldest write
+            del self._entries[next(iter(self._entries))]
+
+    def _refresh_in_background(self, key: tuple[float, float], fetch: Fetcher) -> None:
+        if key in self._refreshing:
+            return
+
+        async def refresh():
+            try:
+                data = await fetch()
+                if data is not None:
+                    self._store(key, data)
+            except Exception:
+                # Keep serving the stale entry; the next expired read retries
+                self.refresh_errors += 1
+            finally:
+                self._refreshing.pop(key, None)
+
+        self._refreshing[key] = asyncio.create_task(refresh())
+
+# Shared by every weather lookup in this process
+weather_cache = WeatherCache()
@@ -2,9 +2,10 @@ from agents import Agent, Runner, AsyncOpenAI, OpenAIChatCompletionsModel, set_t
 import chainlit as cl
 from dotenv import load_dotenv
 from decouple import config
-from tools.weather_api_tool import get_weather
+from tools.weather_api_tool import get_weather, get_weather_many
 from tools.datetime_tool import get_time
 from tools.addition_tool import add
+from tools.deadline import RequestContext, deadline_run_config, within_deadline
 
 # Load environment variables
 load_dotenv()
@@ -29,11 +30,12 @@ multi_tool_agent = Agent(
 You are a versatile assistant that can handle multiple tasks:
 - For math questions like 'What is X + Y?', use the `add` tool to calculate the sum.
 - For weather queries like 'What's the weather in [city]?', use the `get_weather` tool to fetch the current temperature.
+- For weather in several cities at once, call the `get_weather_many` tool a single time with all the cities.
 - For time queries like 'What time is it in [timezone]?', use the `get_time` tool to provide the current time.
 If the user's request doesn't match these tasks, respond politely that you can only handle math, weather, or time queries.
 """,
     model=gemini_model,
-    tools=[add, get_weather, get_time]
+    tools=[add, get_weather, get_weather_many, get_time]
 )
 
 # Terminal-based testing for the multi-tool agent
@@ -56,11 +58,17 @@ async def main(message: cl.Message):
     message_history = cl.user_session.get("message_history")
     message_history.append({"role": "user", "content": user_input})
 
-    # Run the agent with the user input
-    result = Runner.run_sync(multi_tool_agent, user_input)
-
-    # Get the agent's response
-    response = result.final_output
+    # Run the agent with the user input and a fresh latency budget that bounds the whole run
+    context = RequestContext()
+    try:
+        async with within_deadline(context):
+            result = await Runner.run(
+                multi_tool_agent, user_input, context=context, run_config=deadline_run_config(context)
+            )
+        # Get the agent's response
+        response = result.final_output
+    except TimeoutError:
+        response = "Sorry, that took too long to answer. Please try again."
 
     # Update message history with the agent's response
     message_history.append({"role": "assistant", "content": response})
@@ -0,0 +1,59 @@
+# deadline.py
+import asyncio
+import dataclasses
+import time
+from dataclasses import dataclass, field
+from typing import Any
+from agents import ModelSettings, RunConfig
+from decouple import config
+
+# Total latency budget (seconds) for one user request, set at the entry point
+REQUEST_BUDGET = config("REQUEST_BUDGET", default=30.0, cast=float)
+
+@dataclass
+class Deadline:
+    """Point in time by which the current user request must be answered."""
+    expires_at: float
+
+    @classmethod
+    def after(cls, seconds: float = REQUEST_BUDGET) -> "Deadline":
+        return cls(time.monotonic() + seconds)
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+@dataclass
+class RequestContext:
+    """Run context for apps that have no context of their own; carries the deadline."""
+    deadline: Deadline = field(default_factory=Deadline.after)
+
+def deadline_of(ctx: Any) -> Deadline | None:
+    """Returns the Deadline carried by a RunContextWrapper (or a bare context), if any."""
+    context = getattr(ctx, "context", ctx)
+    if isinstance(context, dict):
+        return context.get("deadline")
+    return getattr(context, "deadline", None)
+
+def time_left(ctx: Any, cap: float) -> float:
+    """Seconds a call may take: the per-call cap, shortened to what is left of the request budget."""
+    deadline = deadline_of(ctx)
+    return cap if deadline is None else min(cap, deadline.remaining())
+
+def within_deadline(ctx: Any) -> asyncio.Timeout:
+    """
+    Bounds a whole agent run by the request budget:
+    `async with within_deadline(ctx): await Runner.run(...)` raises TimeoutError once it is spent.
+    """
+    deadline = deadline_of(ctx)
+    return asyncio.timeout(None if deadline is None else deadline.remaining())
+
+def deadline_run_config(ctx: Any, run_config: RunConfig | None = None) -> RunConfig:
+    """The run config with the remaining budget as the model client's request timeout."""
+    run_config = run_config or RunConfig()
+    budget = ModelSettings(extra_args={"timeout": time_left(ctx, REQUEST_BUDGET)})
+    settings = run_config.model_settings.resolve(budget) if run_config.model_settings else budget
+    return dataclasses.replace(run_config, model_settings=settings)
@@ -5,9 +5,12 @@ from agents import Agent, Runner, AsyncOpenAI, OpenAIChatCompletionsModel, Agent
 from pydantic import BaseModel
 from dataclasses import dataclass
 from typing import List, Optional
-from tools.weather_api_tool import get_weather
+from tools.weather_api_tool import get_weather, get_weather_many
 from tools.datetime_tool import get_time
 from tools.addition_tool import add
+from tools.deadline import Deadline, deadline_run_config, within_deadline
+from tools.response_cache import CachedModel
+from tools.model_router import RoutedModel
 
 # Load environment variables
 load_dotenv()
@@ -26,12 +29,22 @@ gemini_model = OpenAIChatCompletionsModel(
     openai_client=gemini_client,
 )
 
+# Cheaper tier for simple turns; RoutedModel picks per turn and escalates to gemini_model on failure
+gemini_fast_model = OpenAIChatCompletionsModel(
+    model=config("GEMINI_FAST_MODEL", default="gemini-2.5-flash"),
+    openai_client=gemini_client,
+)
+routed_model = RoutedModel(fast=gemini_fast_model, strong=gemini_model)
+# Same routing with each tier cached on its own, so a stored reply is keyed by the model that wrote it
+cached_routed_model = RoutedModel(fast=CachedModel(gemini_fast_model), strong=CachedModel(gemini_model))
+
 # Custom context for dependency injection
 @dataclass
 class UserContext:
     uid: str
     is_pro_user: bool
     name: Optional[str] = None
+    deadline: Optional[Deadline] = None
 
     async def fetch_preferences(self) -> dict:
         return {"preferred_timezone": "UTC", "language": "English"}
@@ -71,7 +84,7 @@ math_model_settings = ModelSettings(tool_choice="required")
 math_agent = Agent[UserContext](
     name="Math Agent",
     instructions="Handle mathematical queries, such as addition.",
-    model=gemini_model,
+    model=routed_model,
     tools=[add],
     model_settings=math_model_settings,
 )
@@ -80,7 +93,7 @@ time_model_settings = ModelSettings(tool_choice="required")
 time_agent = Agent[UserContext](
     name="Time Agent",
     instructions="Provide time-related information using the get_time tool.",
-    model=gemini_model,
+    model=routed_model,
     tools=[get_time],
     model_settings=time_model_settings,
 )
@@ -88,7 +101,8 @@ time_agent = Agent[UserContext](
 calendar_agent = Agent[UserContext](
     name="Calendar Agent",
     instructions="Extract calendar events from text and return structured output.",
-    model=gemini_model,
+    # Structured extraction: the same text always yields the same event, so replies are cached
+    model=cached_routed_model,
     output_type=CalendarEvent,
 )
 
@@ -97,8 +111,8 @@ main_model_settings = ModelSettings(tool_choice="auto", temperature=0.7)
 main_agent = Agent[UserContext](
     name="Assistant Agent",
     instructions=dynamic_instructions,
-    model=gemini_model,
-    tools=[get_weather, get_time, add],
+    model=routed_model,
+    tools=[get_weather, get_weather_many, get_time, add],
     handoffs=[math_agent, time_agent, calendar_agent],
     hooks=CustomAgentHooks(),
     model_settings=main_model_settings,
@@ -112,9 +126,14 @@ fun_agent = main_agent.clone(
 
 # Terminal-based testing for the main agent
 if __name__ == "__main__":
-    user_context = UserContext(uid="user123", is_pro_user=True, name="Alice")
+    user_context = UserContext(uid="user123", is_pro_user=True, name="Alice", deadline=Deadline.after())
     runner = Runner()
-    result = runner.run_sync(main_agent, "tell me the weather of the karachi?", context=user_context)
+    result = runner.run_sync(
+        main_agent,
+        "tell me the weather of the karachi?",
+        context=user_context,
+        run_config=deadline_run_config(user_context),
+    )
     print(result.final_output)
 
 # Chainlit interface (replace the existing Chainlit section in main.py)
@@ -124,8 +143,8 @@ async def start():
 
 @cl.on_message
 async def main(message: cl.Message):
-    # Create user context
-    user_context = UserContext(uid="user123", is_pro_user=True, name="Alice")
+    # Create user context with this request's latency budget
+    user_context = UserContext(uid="user123", is_pro_user=True, name="Alice", deadline=Deadline.after())
 
     # Apply guardrail
     guardrail_result = await input_guardrail(user_context, message.content)
@@ -139,21 +158,29 @@ async def main(message: cl.Message):
     # Check if input contains "fun" to decide which agent to run
     if "fun" in message.content.lower():
         try:
-            fun_result = await runner.run(
-                starting_agent=fun_agent,  # Run fun_agent for "fun" queries
-                input=message.content,
-                context=user_context,
-            )
+            async with within_deadline(user_context):  # the whole run stops when the budget is spent
+                fun_result = await runner.run(
+                    starting_agent=fun_agent,  # Run fun_agent for "fun" queries
+                    input=message.content,
+                    context=user_context,
+                    run_config=deadline_run_config(user_context),
+                )
             await cl.Message(content=f"Fun Agent: {fun_result.final_output}").send()
+        except TimeoutError:
+            await cl.Message(content="Sorry, that took too long to answer. Please try again.").send()
         except Exception as e:
             await cl.Message(content=f"Error from Fun Agent: {str(e)}").send()
     else:
         try:
-            result = await runner.run(
-                starting_agent=main_agent,  # Run main_agent for other queries
-                input=message.content,
-                context=user_context,
-            )
+            async with within_deadline(user_context):  # the whole run stops when the budget is spent
+                result = await runner.run(
+                    starting_agent=main_agent,  # Run main_agent for other queries
+                    input=message.content,
+                    context=user_context,
+                    run_config=deadline_run_config(user_context),
+                )
             await cl.Message(content=f"Main Agent: {result.final_output}").send()
+        except TimeoutError:
+            await cl.Message(content="Sorry, that took too long to answer. Please try again.").send()
         except Exception as e:
             await cl.Message(content=f"Error from Main Agent: {str(e)}").send()
\ No newline at end of file
@@ -0,0 +1,172 @@
+# model_router.py
+import re
+import time
+from collections import defaultdict
+from typing import Any
+from agents import Model, ModelResponse
+from openai import APIError, RateLimitError
+from decouple import config, Csv
+
+# Latest user message longer than this (characters) counts as a complex turn
+MODEL_ROUTER_LONG_INPUT = config("MODEL_ROUTER_LONG_INPUT", default=800, cast=int)
+# Complexity score from which a turn goes straight to the strong model
+MODEL_ROUTER_STRONG_AT = config("MODEL_ROUTER_STRONG_AT", default=2, cast=int)
+# USD per million input, output tokens (Gemini 2.5 Flash / Pro list prices), for the cost metric
+MODEL_ROUTER_FAST_PRICE = config("MODEL_ROUTER_FAST_PRICE", default="0.30,2.50", cast=Csv(float))
+MODEL_ROUTER_STRONG_PRICE = config("MODEL_ROUTER_STRONG_PRICE", default="1.25,10.00", cast=Csv(float))
+
+# Requests that usually need multi-step reasoning
+_REASONING = re.compile(
+    r"\b(why|explain|prove|derive|compare|analy[sz]e|step by step|plan|design|debug|optimi[sz]e)\b", re.IGNORECASE
+)
+
+def _text(content: Any) -> str:
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return " ".join(part.get("text", "") for part in content if isinstance(part, dict))
+    return ""
+
+def turn_features(input, tools, output_schema, handoffs) -> dict:
+    """Local features of the turn that predict whether the fast model is enough."""
+    items = [{"role": "user", "content": input}] if isinstance(input, str) else list(input)
+    last_user = next((i for i in reversed(range(len(items))) if items[i].get("role") == "user"), -1)
+    since_user = items[last_user + 1:]
+    return {
+        "chars": len(_text(items[last_user].get("content"))) if last_user >= 0 else 0,
+        "reasoning": last_user >= 0 and bool(_REASONING.search(_text(items[last_user].get("content")))),
+        "tools": len(tools) + len(handoffs),
+        "structured": output_schema is not None and not output_schema.is_plain_text(),
+        # Tool-only turns already taken for this message, and whether a tool result is waiting to be phrased
+        "tool_turns": sum(1 for item in since_user if item.get("type") == "function_call"),
+        "after_tool": bool(items) and items[-1].get("type") == "function_call_output",
+    }
+
+def complexity(features: dict) -> int:
+    score = 0
+    if features["chars"] > MODEL_ROUTER_LONG_INPUT:
+        score += 2
+    if features["reasoning"]:
+        score += 2
+    if features["structured"]:
+        score += 1
+    if features["tools"] > 4:
+        score += 1
+    if features["tool_turns"] >= 3:
+        score += 1  # a long tool chain: the task is not routine
+    elif features["after_tool"]:
+        score -= 1  # only has to put a tool result into words
+    return score
+
+class _RouteStats:
+    def __init__(self):
+        self.calls = 0
+        self.failures = 0
+        self.latency = 0.0
+        self.input_tokens = 0
+        self.output_tokens = 0
+
+class RoutedModel(Model):
+    """
+    Sends each turn to the fast or the strong model based on local features of the input.
+
+    Simple turns (short questions, phrasing a tool result) go to the fast
+    model; long, reasoning-heavy or structured turns go to the strong one. A
+    fast-model call that errors, returns nothing, or returns output that does
+    not match the agent's output type is retried on the strong model. A 429 is
+    raised instead: both tiers share the endpoint's quota, so escalating would
+    only spend more of it.
+    Streamed calls are routed the same way but cannot be escalated.
+    """
+
+    def __init__(
+        self,
+        fast: Model,
+        strong: Model,
+        strong_at: int = MODEL_ROUTER_STRONG_AT,
+        fast_price: list[float] = MODEL_ROUTER_FAST_PRICE,
+        strong_price: list[float] = MODEL_ROUTER_STRONG_PRICE,
+    ):
+        self.models = {"fast": fast, "strong": strong}
+        self.prices = {"fast": fast_price, "strong": strong_price}
+        self.strong_at = strong_at
+        self.escalations = 0
+        self._stats: dict[str, _RouteStats] = defaultdict(_RouteStats)
+
+    def route(self, input, tools, output_schema, handoffs) -> str:
+        features = turn_features(input, tools, output_schema, handoffs)
+        return "strong" if complexity(features) >= self.strong_at else "fast"
+
+    async def get_response(
+        self, system_instructions, input, model_settings, tools, output_schema, handoffs, tracing, **kwargs
+    ) -> ModelResponse:
+        args = (system_instructions, input, model_settings, tools, output_schema, handoffs, tracing)
+        if self.route(input, tools, output_schema, handoffs) == "fast":
+            try:
+                response = await self._call("fast", *args, **kwargs)
+                if self._adequate(response, output_schema):
+                    return response
+            except RateLimitError:
+                raise
+            except (APIError, TimeoutError):
+                pass
+            self.escalations += 1
+        return await self._call("strong", *args, **kwargs)
+
+    def stream_response(
+        self, system_instructions, input, model_settings, tools, output_schema, handoffs, tracing, **kwargs
+    ):
+        route = self.route(input, tools, output_schema, handoffs)
+        self._stats[route].calls += 1
+        return self.models[route].stream_response(
+            system_instructions, input, model_settings, tools, output_schema, handoffs, tracing, **kwargs
+        )
+
+    async def _call(self, route: str, *args, **kwargs) -> ModelResponse:
+        stats = self._stats[route]
+        stats.calls += 1
+        started = time.perf_counter()
+        try:
+            response = await self.models[route].get_response(*args, **kwargs)
+        except Exception:
+            stats.failures += 1
+            raise
+        finally:
+            stats.latency += time.perf_counter() - started
+        stats.input_tokens += response.usage.input_tokens
+        stats.output_tokens += response.usage.output_tokens
+        return response
+
+    @staticmethod
+    def _adequate(response: ModelResponse, output_schema) -> bool:
+        if not response.output:
+            return False
+        if output_schema is None or output_schema.is_plain_text():
+            return True
+        texts = [
+            part.text
+            for item in response.output if getattr(item, "type", None) == "message"
+            for part in item.content if getattr(part, "type", None) == "output_text"
+        ]
+        if not texts:
+            return True  # tool calls only; the output is checked on a later turn
+        try:
+            output_schema.validate_json(texts[-1])
+        except Exception:
+            return False
+        return True
+
+    def stats(self) -> dict:
+        """Returns per-route calls, failures, average latency, tokens and estimated cost, plus escalations."""
+        routes = {}
+        for route, s in self._stats.items():
+            price_in, price_out = self.prices[route]
+            routes[route] = {
+                "calls": s.calls,
+                "failures": s.failures,
+                "avg_latency_ms": round(s.latency / s.calls * 1000, 1) if s.calls else 0.0,
+                "input_tokens": s.input_tokens,
+                "output_tokens": s.output_tokens,
+                "cost_usd": round((s.input_tokens * price_in + s.output_tokens * price_out) / 1e6, 6),
+            }
+        return {"routes": routes, "escalations": self.escalations}
@@ -0,0 +1,183 @@
+# response_cache.py
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+from agents import Model, ModelResponse, Usage
+from openai.types.responses import ResponseOutputItem
+from pydantic import BaseModel, TypeAdapter
+from decouple import config
+
+# Where responses are persisted, how long (seconds) they stay valid, and how many are kept
+RESPONSE_CACHE_PATH = config("RESPONSE_CACHE_PATH", default=".cache/responses.sqlite3")
+RESPONSE_CACHE_TTL = config("RESPONSE_CACHE_TTL", default=86400.0, cast=float)
+RESPONSE_CACHE_SIZE = config("RESPONSE_CACHE_SIZE", default=256, cast=int)
+RESPONSE_CACHE_MAX_ROWS = config("RESPONSE_CACHE_MAX_ROWS", default=10000, cast=int)
+
+_output_items = TypeAdapter(list[ResponseOutputItem])
+
+def _jsonable(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json", exclude_none=True)
+    if hasattr(value, "to_json_dict"):
+        return value.to_json_dict()
+    return str(value)
+
+def request_key(model: str, system_instructions, input, model_settings, tools, output_schema, handoffs, **kwargs) -> str:
+    """Hash of everything that can change the reply: model, messages, tool and output schemas, settings."""
+    settings = model_settings.to_json_dict()
+    if settings.get("extra_args"):
+        # The client timeout (the request's remaining budget) does not change the reply
+        settings["extra_args"] = {k: v for k, v in settings["extra_args"].items() if k != "timeout"}
+    request = {
+        "model": model,
+        "system": system_instructions,
+        "input": input,
+        "settings": settings,
+        "tools": [
+            [tool.name, getattr(tool, "description", None), getattr(tool, "params_json_schema", None)]
+            for tool in tools
+        ],
+        "output": None if output_schema is None or output_schema.is_plain_text() else output_schema.json_schema(),
+        "handoffs": [[h.tool_name, h.tool_description, h.input_json_schema] for h in handoffs],
+        "extra": kwargs,
+    }
+    data = json.dumps(request, sort_keys=True, default=_jsonable)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+class ResponseCache:
+    """
+    Request hash -> model response, with an LRU in memory over a SQLite file.
+
+    Entries expire after the TTL; the file keeps at most `max_rows` entries,
+    dropping the oldest first.
+    """
+
+    def __init__(
+        self,
+        path: str = RESPONSE_CACHE_PATH,
+        ttl: float = RESPONSE_CACHE_TTL,
+        max_size: int = RESPONSE_CACHE_SIZE,
+        max_rows: int = RESPONSE_CACHE_MAX_ROWS,
+    ):
+        self.ttl = ttl
+        self.max_size = max_size
+        self.max_rows = max_rows
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self._memory: OrderedDict[str, tuple[str, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, response TEXT NOT NULL, cached_at REAL NOT NULL)"
+        )
+        self._db.commit()
+
+    def get(self, key: str) -> ModelResponse | None:
+        """Returns the cached response (with zero usage: no tokens were spent), or None."""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None:
+                entry = self._db.execute(
+                    "SELECT response, cached_at FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if entry is not None:
+                    self._remember(key, entry)
+            if entry is None:
+                self.misses += 1
+                return None
+            if time.time() - entry[1] > self.ttl:
+                self._memory.pop(key, None)
+                self.expired += 1
+                return None
+            self._memory.move_to_end(key)
+            self.hits += 1
+
+        data = json.loads(entry[0])
+        return ModelResponse(
+            output=_output_items.validate_python(data["output"]),
+            usage=Usage(),
+            response_id=data["response_id"],
+        )
+
+    def put(self, key: str, response: ModelResponse) -> None:
+        """Stores a response and evicts stale or excess rows."""
+        data = json.dumps({
+            # Only the fields the model set, so a replayed item feeds the next turn unchanged
+            "output": [item.model_dump(mode="json", exclude_unset=True) for item in response.output],
+            "response_id": response.response_id,
+        })
+        now = time.time()
+        with self._lock:
+            self._remember(key, (data, now))
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses (key, response, cached_at) VALUES (?, ?, ?)", (key, data, now)
+            )
+            self._db.execute("DELETE FROM responses WHERE cached_at < ?", (now - self.ttl,))
+            (rows,) = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()
+            if rows > self.max_rows:
+                self._db.execute(
+                    "DELETE FROM responses WHERE key IN (SELECT key FROM responses ORDER BY cached_at LIMIT ?)",
+                    (rows - self.max_rows,),
+                )
+            self._db.commit()
+
+    def stats(self) -> dict:
+        """Returns hit/miss counters for monitoring."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "expired": self.expired,
+                "memory_entries": len(self._memory),
+            }
+
+    def _remember(self, key: str, entry: tuple[str, float]) -> None:
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_size:
+            self._memory.popitem(last=False)
+
+# Shared by every cached model in this process
+response_cache = ResponseCache()
+
+class CachedModel(Model):
+    """
+    Wraps a model so identical requests are answered from the response cache.
+
+    Opt-in per agent (`model=CachedModel(gemini_model)`): use it for
+    classifier-style or low-temperature agents whose reply is effectively
+    fixed by the request. Streamed calls are passed through uncached.
+    Wrap the concrete models inside a RoutedModel, not the router itself:
+    the key names the model, and the router's name hides which tier answered.
+    """
+
+    def __init__(self, model: Model, cache: ResponseCache = response_cache):
+        self.model = model
+        self.cache = cache
+        self.name = getattr(model, "model", type(model).__name__)
+
+    async def get_response(
+        self, system_instructions, input, model_settings, tools, output_schema, handoffs, tracing, **kwargs
+    ) -> ModelResponse:
+        key = request_key(self.name, system_instructions, input, model_settings, tools, output_schema, handoffs, **kwargs)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        response = await self.model.get_response(
+            system_instructions, input, model_settings, tools, output_schema, handoffs, tracing, **kwargs
+        )
+        self.cache.put(key, response)
+        return response
+
+    def stream_response(self, *args, **kwargs):
+        return self.model.stream_response(*args, **kwargs)
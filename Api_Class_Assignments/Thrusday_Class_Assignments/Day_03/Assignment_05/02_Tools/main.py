@@ -2,9 +2,10 @@ import chainlit as cl
 from dotenv import load_dotenv
 from decouple import config
 from agents import Agent, Runner, AsyncOpenAI, OpenAIChatCompletionsModel, set_tracing_disabled
-from tools.weather_api_tool import get_weather
+from tools.weather_api_tool import get_weather, get_weather_many
 from tools.datetime_tool import get_time
 from tools.addition_tool import add
+from tools.deadline import RequestContext, deadline_run_config, within_deadline
 
 # Load environment variables
 load_dotenv()
@@ -28,13 +29,16 @@ main_agent = Agent(
     name="Assistant Agent",
     instructions="You are a helpful assistant. Use the provided tools to answer user queries.",
     model=gemini_model,
-    tools=[get_weather, get_time, add],
+    tools=[get_weather, get_weather_many, get_time, add],
 )
 
 # Terminal-based testing for the main agent
 if __name__ == "__main__":
     runner = Runner()
-    result = runner.run_sync(main_agent, "what the time in the Asia/karachi rn?")
+    context = RequestContext()
+    result = runner.run_sync(
+        main_agent, "what the time in the Asia/karachi rn?", context=context, run_config=deadline_run_config(context)
+    )
     print(result.final_output)
 
 # Chainlit interface
@@ -48,14 +52,20 @@ async def main(message: cl.Message):
         # Initialize runner
         runner = Runner()
         
-        # Run the agent
-        result = await runner.run(
-            starting_agent=main_agent,
-            input=message.content,
-        )
+        # Run the agent within a fresh latency budget for this request
+        context = RequestContext()
+        async with within_deadline(context):
+            result = await runner.run(
+                starting_agent=main_agent,
+                input=message.content,
+                context=context,
+                run_config=deadline_run_config(context),
+            )
         
         # Send the response
         await cl.Message(content=result.final_output).send()
         
+    except TimeoutError:
+        await cl.Message(content="Sorry, that took too long to answer. Please try again.").send()
     except Exception as e:
         await cl.Message(content=f"Error: {str(e)}").send()
\ No newline at end of file
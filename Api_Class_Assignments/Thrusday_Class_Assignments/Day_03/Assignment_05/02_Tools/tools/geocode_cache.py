@@ -0,0 +1,85 @@
+# geocode_cache.py
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from decouple import config
+
+# Where resolved coordinates are persisted and how many stay hot in memory
+GEOCODE_CACHE_PATH = config("GEOCODE_CACHE_PATH", default=".cache/geocode.sqlite3")
+GEOCODE_CACHE_SIZE = config("GEOCODE_CACHE_SIZE", default=1024, cast=int)
+
+def normalize_city(city: str) -> str:
+    """Normalizes a city name so 'Karachi', 'karachi ' and 'KARACHI' share one entry."""
+    return " ".join(city.split()).casefold()
+
+class GeocodeCache:
+    """
+    City -> (lat, lon) cache with an in-memory LRU in front of a SQLite file.
+
+    Coordinates never change, so entries never expire and survive restarts.
+    """
+
+    def __init__(self, path: str = GEOCODE_CACHE_PATH, max_size: int = GEOCODE_CACHE_SIZE):
+        self.max_size = max_size
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._memory: OrderedDict[str, tuple[float, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS geocode (city TEXT PRIMARY KEY, lat REAL NOT NULL, lon REAL NOT NULL)"
+        )
+        self._db.commit()
+
+    def get(self, city: str) -> tuple[float, float] | None:
+        """Returns cached coordinates for the city, or None on a miss."""
+        key = normalize_city(city)
+        with self._lock:
+            coords = self._memory.get(key)
+            if coords is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return coords
+
+            row = self._db.execute("SELECT lat, lon FROM geocode WHERE city = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self.disk_hits += 1
+            self._remember(key, (row[0], row[1]))
+            return row[0], row[1]
+
+    def put(self, city: str, lat: float, lon: float) -> None:
+        """Stores the coordinates in memory and on disk."""
+        key = normalize_city(city)
+        with self._lock:
+            self._remember(key, (lat, lon))
+            self._db.execute("INSERT OR REPLACE INTO geocode (city, lat, lon) VALUES (?, ?, ?)", (key, lat, lon))
+            self._db.commit()
+
+    def stats(self) -> dict:
+        """Returns hit/miss counters for monitoring."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "memory_entries": len(self._memory),
+            }
+
+    def _remember(self, key: str, coords: tuple[float, float]) -> None:
+        self._memory[key] = coords
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_size:
+            self._memory.popitem(last=False)
+
+# Shared by every weather lookup in this process
+geocode_cache = GeocodeCache()
@@ -5,6 +5,7 @@ from agents import Agent, Runner, AsyncOpenAI, OpenAIChatCompletionsModel, set_t
 from tools.weather_api_tool import weather_tool
 from tools.datetime_tool import time_tool
 from tools.addition_tool import addition_tool
+from tools.deadline import RequestContext, deadline_run_config
 
 # Load environment variables
 load_dotenv()
@@ -35,7 +36,10 @@ agent = Agent(
 # Terminal-based testing for the main agent
 if __name__ == "__main__":
     runner = Runner()
-    result = runner.run_sync(agent, "what the time in the Asia/karachi rn?")
+    context = RequestContext()
+    result = runner.run_sync(
+        agent, "what the time in the Asia/karachi rn?", context=context, run_config=deadline_run_config(context)
+    )
     print(result.final_output)
 
 # # Chainlit interface
@@ -53,6 +57,7 @@ if __name__ == "__main__":
 #         result = await runner.run(
 #             starting_agent=agent,
 #             input=message.content,
+#             context=RequestContext(),  # fresh latency budget for this request
 #         )
         
 #         # Send the response
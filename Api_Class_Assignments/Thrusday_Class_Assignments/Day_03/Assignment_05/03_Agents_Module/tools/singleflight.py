@@ -0,0 +1,36 @@
+# singleflight.py
+import asyncio
+from typing import Any, Awaitable, Callable, Hashable
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key into one in-flight upstream call.
+
+    The first caller starts the call; callers arriving while it is running await
+    the same result (or exception) instead of issuing their own request.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.saved = 0
+        self._inflight: dict[Hashable, asyncio.Task] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._inflight.get(key)
+        if task is None:
+            self.calls += 1
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        else:
+            self.saved += 1
+        # Shield so one caller being cancelled does not cancel the shared call
+        return await asyncio.shield(task)
+
+    def stats(self) -> dict:
+        """Returns upstream calls made and calls saved by coalescing."""
+        return {"calls": self.calls, "saved": self.saved, "in_flight": len(self._inflight)}
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
@@ -1,41 +1,237 @@
 # weather_api.py
-import requests
+import asyncio
+import httpx
+from typing import Any
 from decouple import config
-from agents import function_tool
+from agents import function_tool, RunContextWrapper
+from tools.http_pool import get_http_client
+from tools.geocode_cache import geocode_cache, normalize_city
+from tools.gazetteer import gazetteer
+from tools.weather_cache import weather_cache
+from tools.singleflight import SingleFlight
+from tools.deadline import Deadline, deadline_of
+from tools.circuit_breaker import CircuitBreaker, CircuitOpenError
 
 # Load the API key from the environment
 API_KEY = config("WEATHER_API_KEY")
 
+GEO_URL = "http://api.openweathermap.org/geo/1.0/direct"
+WEATHER_URL = "https://api.openweathermap.org/data/2.5/weather"
+
+# Per-call timeout (seconds) for each OpenWeatherMap request
+WEATHER_TIMEOUT = config("WEATHER_TIMEOUT", default=5.0, cast=float)
+# Maximum cities looked up at the same time by get_weather_many
+WEATHER_MAX_CONCURRENCY = config("WEATHER_MAX_CONCURRENCY", default=5, cast=int)
+
+class WeatherLookupError(Exception):
+    """Raised with a user-facing message when a city's weather cannot be fetched."""
+
+# Concurrent lookups for the same city share one upstream request
+weather_flight = SingleFlight()
+# Fails fast while OpenWeatherMap keeps erroring; 4xx answers (unknown city) do not count
+weather_breaker = CircuitBreaker("openweathermap", failures=(httpx.HTTPError,))
+
+async def get_with_breaker(url: str, params: dict, timeout: float) -> httpx.Response:
+    """
+    GETs through the circuit breaker; 5xx and 429 responses count as upstream failures.
+
+    A timeout shortened by the request deadline is ours, not the upstream's: it is raised
+    as TimeoutError, which the breaker neither counts nor retries.
+    """
+    async def attempt() -> httpx.Response:
+        try:
+            response = await get_http_client().get(url, params=params, timeout=timeout)
+        except httpx.TimeoutException as e:
+            if timeout < WEATHER_TIMEOUT:
+                raise TimeoutError("request budget spent") from e
+            raise
+        if response.status_code >= 500 or response.status_code == 429:
+            response.raise_for_status()
+        return response
+
+    return await weather_breaker.call(attempt)
+
+async def geocode(city: str, timeout: float = WEATHER_TIMEOUT) -> tuple[float, float] | None:
+    """
+    Resolves a city name to (lat, lon).
+
+    Tries the geocode cache, then the offline gazetteer (exact names and
+    aliases), and only calls the Geocoding API when both miss. Typos are
+    never corrected here; see fetch_temperature for the suggestions.
+    """
+    cached = geocode_cache.get(city)
+    if cached is not None:
+        return cached
+
+    place = gazetteer.resolve(city)
+    if place is not None:
+        return place.lat, place.lon
+
+    geo_response = await get_with_breaker(GEO_URL, {"q": city.strip(), "limit": 1, "appid": API_KEY}, timeout)
+    if geo_response.status_code != 200 or not geo_response.json():
+        return None
+
+    location = geo_response.json()[0]
+    geocode_cache.put(city, location["lat"], location["lon"])
+    return location["lat"], location["lon"]
+
+async def fetch_current(lat: float, lon: float, timeout: float = WEATHER_TIMEOUT) -> dict | None:
+    """Fetches current conditions from the Current Weather Data API, or None on an API error."""
+    weather_response = await get_with_breaker(
+        WEATHER_URL, {"lat": lat, "lon": lon, "units": "metric", "appid": API_KEY}, timeout
+    )
+    if weather_response.status_code != 200:
+        return None
+    return weather_response.json()
+
+async def lookup_temperature(city: str, deadline: Deadline | None = None) -> float:
+    """
+    Returns the current temperature in Celsius, or raises WeatherLookupError.
+
+    With a deadline, the lookup only uses the time left in the request budget.
+    """
+    remaining = deadline.remaining() if deadline is not None else None
+    if remaining is not None and remaining <= 0:
+        raise WeatherLookupError("Skipped: no time left to fetch weather data for this request.")
+
+    timeout = WEATHER_TIMEOUT if remaining is None else min(WEATHER_TIMEOUT, remaining)
+    try:
+        return await asyncio.wait_for(
+            weather_flight.do(normalize_city(city), lambda: fetch_temperature(city, timeout)),
+            remaining,
+        )
+    except TimeoutError:
+        raise WeatherLookupError("The weather service timed out. Please try again.")
+
+async def fetch_temperature(city: str, timeout: float = WEATHER_TIMEOUT) -> float:
+    try:
+        # Step 1: Get latitude and longitude (cached, or via the Geocoding API)
+        coords = await geocode(city, timeout)
+        if coords is None:
+            # Only now, with the geocoder also empty-handed, offer one-edit corrections
+            suggestions = [f"{p.name} ({p.country})" for p in gazetteer.correct(city)]
+            hint = f" Did you mean: {', '.join(suggestions)}?" if suggestions else ""
+            raise WeatherLookupError(f"City not found. Please check the city name and try again.{hint}")
+
+        # Step 2: Fetch weather data (served from the TTL cache when still fresh)
+        lat, lon = coords
+        weather_data = await weather_cache.get(lat, lon, lambda: fetch_current(lat, lon, timeout))
+    except CircuitOpenError as e:
+        raise WeatherLookupError(
+            f"The weather service is temporarily unavailable (retry in about {e.retry_after}s). "
+            "Answer without live weather for now."
+        )
+    except httpx.TimeoutException:
+        raise WeatherLookupError("The weather service timed out. Please try again.")
+    except httpx.HTTPError:
+        raise WeatherLookupError("An error occurred while fetching weather data.")
+
+    if weather_data is None:
+        raise WeatherLookupError("An error occurred while fetching weather data.")
+
+    return weather_data["main"]["temp"]
+
 @function_tool
-def weather_tool(city: str) -> str:
+async def weather_tool(ctx: RunContextWrapper[Any], city: str) -> str:
     """
     Fetches the current temperature for a given city using the OpenWeatherMap API.
-    
+
     Args:
         city (str): The name of the city to get weather data for.
-    
+
     Returns:
         str: A message with the current temperature in Celsius or an error message.
     """
-    # Step 1: Get latitude and longitude using the Geocoding API
-    geo_url = f"http://api.openweathermap.org/geo/1.0/direct?q={city}&limit=1&appid={API_KEY}"
-    geo_response = requests.get(geo_url)
-    
-    if geo_response.status_code != 200 or not geo_response.json():
-        return "City not found. Please check the city name and try again."
-    
-    location = geo_response.json()[0]
-    lat = location["lat"]
-    lon = location["lon"]
-    
-    # Step 2: Fetch weather data using the Current Weather Data API
-    weather_url = f"https://api.openweathermap.org/data/2.5/weather?lat={lat}&lon={lon}&units=metric&appid={API_KEY}"
-    weather_response = requests.get(weather_url)
-    
-    if weather_response.status_code != 200:
-        return "An error occurred while fetching weather data."
-    
-    weather_data = weather_response.json()
-    temp = weather_data["main"]["temp"]
-    
-    return f"The current temperature in {city} is {temp}°C."
\ No newline at end of file
+    try:
+        temp = await lookup_temperature(city, deadline_of(ctx))
+    except WeatherLookupError as e:
+        return str(e)
+
+    return f"The current temperature in {city} is {temp}°C."
+
+@function_tool
+async def weather_many_tool(ctx: RunContextWrapper[Any], cities: list[str]) -> str:
+    """
+    Fetches the current temperature for several cities in one call.
+    Use this instead of calling get_weather once per city.
+
+    Args:
+        cities (list[str]): The names of the cities, e.g. ["Lahore", "Karachi", "Dubai"].
+
+    Returns:
+        str: One line per city with its temperature in Celsius or an error message.
+    """
+    # Drop duplicates ("Karachi", "karachi ") but keep the first spelling and order
+    unique: dict[str, str] = {}
+    for city in cities:
+        if city.strip():
+            unique.setdefault(normalize_city(city), city.strip())
+
+    deadline = deadline_of(ctx)
+    limit = asyncio.Semaphore(WEATHER_MAX_CONCURRENCY)
+
+    async def one(city: str) -> str:
+        async with limit:
+            try:
+                return f"{city}: {await lookup_temperature(city, deadline)}°C"
+            except WeatherLookupError as e:
+                return f"{city}: {e}"
+
+    lines = await asyncio.gather(*(one(city) for city in unique.values()))
+    return "\n".join(lines) if lines else "No cities were provided."
+
+if __name__ == "__main__":
+    # Benchmark: concurrent lookups against a local stub answering in 100 ms, blocking
+    # (a new connection per call, one city at a time) vs async on the shared pool
+    import json
+    import os
+    import tempfile
+    import threading
+    import time
+    import zlib
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class SlowStub(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def do_GET(self):
+            time.sleep(0.1)
+            # Distinct coordinates per city, so no two lookups share a weather cache entry
+            spot = zlib.crc32(self.path.encode())
+            payload = [{"lat": spot % 1700 / 10 - 85, "lon": spot % 3500 / 10 - 175}] if "/geo/" in self.path else {"main": {"temp": 20.0}}
+            body = json.dumps(payload).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    ThreadingHTTPServer.daemon_threads = True
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SlowStub)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    GEO_URL = f"http://127.0.0.1:{server.server_port}/geo/1.0/direct"
+    WEATHER_URL = f"http://127.0.0.1:{server.server_port}/data/2.5/weather"
+    # A throwaway geocode cache, so the stub's made-up cities never reach the real one
+    geocode_cache = type(geocode_cache)(os.path.join(tempfile.mkdtemp(), "geocode.sqlite3"))
+
+    def blocking(city: str) -> float:
+        coords = httpx.get(GEO_URL, params={"q": city, "limit": 1, "appid": API_KEY}).json()[0]
+        params = {"lat": coords["lat"], "lon": coords["lon"], "units": "metric", "appid": API_KEY}
+        return httpx.get(WEATHER_URL, params=params).json()["main"]["temp"]
+
+    async def main():
+        for n in (1, 5, 20, 50):
+            started = time.perf_counter()
+            for i in range(n):
+                blocking(f"blocking-{n}-{i}")
+            sequential = time.perf_counter() - started
+            started = time.perf_counter()
+            await asyncio.gather(*(lookup_temperature(f"pooled-{n}-{i}") for i in range(n)))
+            pooled = time.perf_counter() - started
+            print(f"{n:>3} cities: blocking {sequential:.2f}s, async pooled {pooled:.2f}s ({sequential / pooled:.1f}x)")
+
+    asyncio.run(main())
@@ -2,9 +2,10 @@ import chainlit as cl
 from dotenv import load_dotenv
 from decouple import config
 from agents import Agent, Runner, AsyncOpenAI, OpenAIChatCompletionsModel, set_tracing_disabled, AgentHooks, RunContextWrapper
-from tools.weather_api_tool import get_weather
+from tools.weather_api_tool import get_weather, get_weather_many
 from tools.datetime_tool import get_time
 from tools.addition_tool import add
+from tools.deadline import RequestContext, deadline_run_config, within_deadline
 import asyncio
 from typing import Any
 
@@ -49,10 +50,13 @@ class MyAgentHooks(AgentHooks):
 # 6. Sub-agent for weather
 weather_agent = Agent(
     name="WeatherSpecialist",
-    instructions="You are specialized in answering only weather questions.",
+    instructions=(
+        "You are specialized in answering only weather questions. "
+        "For several cities at once, call get_weather_many a single time with all of them."
+    ),
     model=gemini_model,
     hooks=MyAgentHooks(),
-    tools=[get_weather],
+    tools=[get_weather, get_weather_many],
 )
 
 # 5. Main agent
@@ -72,10 +76,14 @@ agent_clone = main_agent.clone(name="UtilityAgentClone")
 if __name__ == "__main__":
     async def test_agent():
         runner = Runner()
-        result = await runner.run(
-            starting_agent=main_agent,
-            input="what the weather in the Asia/karachi rn?"
-        )
+        context = RequestContext()
+        async with within_deadline(context):
+            result = await runner.run(
+                starting_agent=main_agent,
+                input="what the weather in the Asia/karachi rn?",
+                context=context,
+                run_config=deadline_run_config(context),
+            )
         print(result.final_output)
     
     asyncio.run(test_agent())
@@ -91,14 +99,20 @@ async def main(message: cl.Message):
         # Initialize runner
         runner = Runner()
         
-        # Run the agent
-        result = await runner.run(
-            starting_agent=main_agent,
-            input=message.content,
-        )
+        # Run the agent within a fresh latency budget for this request
+        context = RequestContext()
+        async with within_deadline(context):
+            result = await runner.run(
+                starting_agent=main_agent,
+                input=message.content,
+                context=context,
+                run_config=deadline_run_config(context),
+            )
         
         # Send the response
         await cl.Message(content=result.final_output).send()
         
+    except TimeoutError:
+        await cl.Message(content="Sorry, that took too long to answer. Please try again.").send()
     except Exception as e:
         await cl.Message(content=f"Error: {str(e)}").send()
\ No newline at end of file
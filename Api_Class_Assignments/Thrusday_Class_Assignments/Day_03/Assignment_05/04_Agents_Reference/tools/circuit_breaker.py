@@ -0,0 +1,161 @@
+# circuit_breaker.py
+import asyncio
+import math
+import random
+import time
+from typing import Any, Awaitable, Callable
+from decouple import config
+
+# Consecutive failures that open a breaker, and how long it stays open
+BREAKER_FAILURE_THRESHOLD = config("BREAKER_FAILURE_THRESHOLD", default=5, cast=int)
+BREAKER_RESET_TIMEOUT = config("BREAKER_RESET_TIMEOUT", default=30.0, cast=float)
+# Retries per call, and the process-wide retry budget (retries earned per request, cap)
+BREAKER_MAX_RETRIES = config("BREAKER_MAX_RETRIES", default=2, cast=int)
+RETRY_BUDGET_RATIO = config("RETRY_BUDGET_RATIO", default=0.2, cast=float)
+RETRY_BUDGET_MAX = config("RETRY_BUDGET_MAX", default=10.0, cast=float)
+# Full-jitter exponential backoff between retries (seconds)
+BACKOFF_BASE = config("BACKOFF_BASE", default=0.2, cast=float)
+BACKOFF_MAX = config("BACKOFF_MAX", default=2.0, cast=float)
+
+class CircuitOpenError(Exception):
+    """Raised without calling upstream while a breaker is open."""
+
+    def __init__(self, name: str, retry_after: float):
+        self.name = name
+        self.retry_after = max(1, math.ceil(retry_after))
+        super().__init__(f"{name} is temporarily unavailable; retry in about {self.retry_after}s.")
+
+class RetryBudget:
+    """
+    Caps retries to a fraction of overall traffic.
+
+    Every call deposits `ratio` tokens and every retry withdraws one, so a
+    failing upstream cannot multiply the load it receives.
+    """
+
+    def __init__(self, ratio: float = RETRY_BUDGET_RATIO, max_tokens: float = RETRY_BUDGET_MAX):
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self.tokens = max_tokens
+        self.denied = 0
+
+    def record_call(self) -> None:
+        self.tokens = min(self.max_tokens, self.tokens + self.ratio)
+
+    def try_retry(self) -> bool:
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        self.denied += 1
+        return False
+
+# Shared by every breaker in this process
+retry_budget = RetryBudget()
+# name -> breaker, for monitoring
+breakers: dict[str, "CircuitBreaker"] = {}
+
+class CircuitBreaker:
+    """
+    Closed -> open after `failure_threshold` consecutive failures; open ->
+    half-open after `reset_timeout`, letting one trial call through. Only
+    that trial's result closes or reopens a half-open breaker; calls admitted
+    before it opened and finishing late leave the state as is.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+        reset_timeout: float = BREAKER_RESET_TIMEOUT,
+        max_retries: int = BREAKER_MAX_RETRIES,
+        budget: RetryBudget = retry_budget,
+        failures: tuple[type[BaseException], ...] = (Exception,),
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.max_retries = max_retries
+        self.budget = budget
+        self.failures = failures
+        self.state = "closed"
+        self.trips = 0
+        self.rejected = 0
+        self.retries = 0
+        self.consecutive_failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        breakers[name] = self
+
+    async def call(self, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Runs `fn` with retries and jittered backoff, or fails fast while open."""
+        trial = self._before_call()
+        self.budget.record_call()
+        attempt = 0
+        while True:
+            try:
+                result = await fn()
+            except self.failures:
+                self._on_failure(trial)
+                if self.state != "closed" or attempt >= self.max_retries or not self.budget.try_retry():
+                    raise
+                attempt += 1
+                self.retries += 1
+                await asyncio.sleep(random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt)))
+            except BaseException:
+                # Cancelled (e.g. out of time): neither a success nor an upstream failure
+                if trial:
+                    self._trial_in_flight = False
+                raise
+            else:
+                self._on_success(trial)
+                return result
+
+    def stats(self) -> dict:
+        """Returns breaker state and counters for monitoring."""
+        return {
+            "state": self.state,
+            "trips": self.trips,
+            "rejected": self.rejected,
+            "retries": self.retries,
+            "consecutive_failures": self.consecutive_failures,
+        }
+
+    def _before_call(self) -> bool:
+        """Raises CircuitOpenError or admits the call; returns True if it is the half-open trial."""
+        if self.state == "open":
+            waited = time.monotonic() - self._opened_at
+            if waited < self.reset_timeout:
+                self.rejected += 1
+                raise CircuitOpenError(self.name, self.reset_timeout - waited)
+            self.state = "half_open"
+        if self.state == "half_open":
+            if self._trial_in_flight:
+                self.rejected += 1
+                raise CircuitOpenError(self.name, self.reset_timeout)
+            self._trial_in_flight = True
+            return True
+        return False
+
+    def _on_success(self, trial: bool) -> None:
+        if trial:
+            self._trial_in_flight = False
+            self.state = "closed"
+        if self.state == "closed":
+            self.consecutive_failures = 0
+
+    def _on_failure(self, trial: bool) -> None:
+        self.consecutive_failures += 1
+        if trial:
+            self._trial_in_flight = False
+        if trial or (self.state == "closed" and self.consecutive_failures >= self.failure_threshold):
+            if self.state != "open":
+                self.trips += 1
+            self.state = "open"
+            self._opened_at = time.monotonic()
+
+def breaker_stats() -> dict:
+    """Returns the state of every breaker plus the shared retry budget."""
+    return {
+        "breakers": {name: breaker.stats() for name, breaker in breakers.items()},
+        "retry_budget": {"tokens": round(retry_budget.tokens, 2), "denied": retry_budget.denied},
+    }
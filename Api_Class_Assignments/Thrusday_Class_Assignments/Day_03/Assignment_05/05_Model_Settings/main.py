@@ -18,9 +18,10 @@ from agents import (
 import chainlit as cl
 
 # Your tool functions (example modules)
-from tools.weather_api_tool import get_weather
+from tools.weather_api_tool import get_weather, get_weather_many
 from tools.datetime_tool import get_time
 from tools.addition_tool import add_numbers
+from tools.deadline import Deadline, deadline_run_config, within_deadline
 
 # Load .env
 load_dotenv()
@@ -57,13 +58,17 @@ model_settings = ModelSettings(
 class UserContext:
     user_id: str
     locale: str
+    deadline: Deadline | None = None
 
 # Build the agent
 agent = Agent[UserContext](
     name="GeminiToolAgent",
-    instructions="You are a helpful agent. When appropriate use the tools provided to answer user queries.",
+    instructions=(
+        "You are a helpful agent. When appropriate use the tools provided to answer user queries. "
+        "For weather in several cities, call get_weather_many once with all of them."
+    ),
     model=gemini_model,
-    tools=[get_weather, get_time, add_numbers],
+    tools=[get_weather, get_weather_many, get_time, add_numbers],
     model_settings=model_settings,
 )
 
@@ -107,19 +112,22 @@ async def main(message: cl.Message):
         # Get session ID from user session or generate a new one
         session_id = cl.user_session.get("session_id") or str(uuid.uuid4())
         
-        # Create user context
-        context = UserContext(user_id=session_id, locale="en-US")
+        # Create user context with this request's latency budget
+        context = UserContext(user_id=session_id, locale="en-US", deadline=Deadline.after())
         
         # Show typing indicator
         await cl.Message(content="Thinking...").send()
         
-        # Run the agent using the global runner instance
-        result = await runner.run(agent, message.content, context=context)
+        # Run the agent using the global runner instance; the whole run stops when the budget is spent
+        async with within_deadline(context):
+            result = await runner.run(agent, message.content, context=context, run_config=deadline_run_config(context))
         
         # Send the response
         response_content = result.final_output or "I couldn't generate a response. Please try again."
         await cl.Message(content=response_content).send()
         
+    except TimeoutError:
+        await cl.Message(content="Sorry, that took too long to answer. Please try again.").send()
     except Exception as e:
         # Handle errors gracefully
         error_message = f"An error occurred: {str(e)}"
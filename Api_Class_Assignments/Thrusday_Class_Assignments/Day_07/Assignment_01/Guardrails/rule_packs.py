@@ -0,0 +1,197 @@
+import json
+import os
+import re
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from decouple import config
+
+# How often (seconds) the pack files are checked for changes
+RULES_CHECK_INTERVAL = config("RULES_CHECK_INTERVAL", default=1.0, cast=float)
+
+
+@dataclass(frozen=True)
+class RuleMatch:
+    pack: str
+    rule: str
+    text: str
+
+
+@dataclass(frozen=True)
+class CompiledPacks:
+    """One immutable generation of rule packs."""
+    versions: dict
+    # Every term of every pack as one alternation, with a named group per term
+    terms: re.Pattern | None
+    # Named group -> (order, pack name, rule id)
+    term_rules: dict
+    # (order, pack name, rule id, pattern) for each regex rule, compiled on its own
+    regex_rules: list
+
+
+def load_pack(path: str) -> dict:
+    """
+    Reads and validates a rule pack:
+    {"name": ..., "version": ..., "terms": [...], "regex": [{"id": ..., "pattern": ...}]}.
+
+    Terms match anywhere in the text; regex rules give finer control (word
+    boundaries, alternations, backreferences). All rules are case-insensitive.
+    Raises ValueError naming the pack and rule when a rule is malformed or
+    its pattern does not compile.
+    """
+    with open(path, encoding="utf-8") as f:
+        pack = json.load(f)
+    if not isinstance(pack, dict):
+        raise ValueError(f"{path}: a rule pack must be a JSON object")
+    pack.setdefault("name", os.path.splitext(os.path.basename(path))[0])
+    pack.setdefault("version", 0)
+    pack.setdefault("terms", [])
+    pack.setdefault("regex", [])
+
+    name = pack["name"]
+    if not isinstance(pack["terms"], list):
+        raise ValueError(f"{name}: 'terms' must be a list of strings")
+    if not isinstance(pack["regex"], list):
+        raise ValueError(f"{name}: 'regex' must be a list of rules")
+    if not all(isinstance(t, str) and t.strip() for t in pack["terms"]):
+        raise ValueError(f"{name}: every term must be a non-empty string")
+    ids = set()
+    for rule in pack["regex"]:
+        if not isinstance(rule, dict) or not isinstance(rule.get("id"), str) or not isinstance(rule.get("pattern"), str):
+            raise ValueError(f"{name}: every regex rule needs a string 'id' and 'pattern'")
+        if rule["id"] in ids:
+            raise ValueError(f"{name}: duplicate regex rule id '{rule['id']}'")
+        ids.add(rule["id"])
+        try:
+            re.compile(rule["pattern"], re.IGNORECASE)
+        except re.error as e:
+            raise ValueError(f"{name}/regex:{rule['id']}: {e}") from e
+    return pack
+
+
+def compile_packs(packs: list[dict]) -> CompiledPacks:
+    """
+    Compiles the terms into one alternation and each regex rule on its own.
+
+    Regex rules are not joined: numbered backreferences would point at the
+    wrong group, and two rules using the same group name would not compile.
+    """
+    alternatives, term_rules, regex_rules = [], {}, []
+    order = 0
+    for pack in packs:
+        for term in pack["terms"]:
+            group = f"t{len(term_rules)}"
+            term_rules[group] = (order, pack["name"], f"term:{term}")
+            alternatives.append(f"(?P<{group}>{re.escape(term.lower())})")
+            order += 1
+        for rule in pack["regex"]:
+            regex_rules.append((order, pack["name"], f"regex:{rule['id']}", re.compile(rule["pattern"], re.IGNORECASE)))
+            order += 1
+    terms = re.compile("|".join(alternatives), re.IGNORECASE) if alternatives else None
+    return CompiledPacks({p["name"]: p["version"] for p in packs}, terms, term_rules, regex_rules)
+
+
+def first_match(packs: CompiledPacks, text: str) -> tuple[str, str, str] | None:
+    """(pack, rule, matched text) of the leftmost match; on a tie, the rule listed first."""
+    best = None
+    if packs.terms is not None:
+        found = packs.terms.search(text)
+        if found is not None:
+            order, pack, rule = packs.term_rules[found.lastgroup]
+            best = (found.start(), order, pack, rule, found.group(0))
+    for order, pack, rule, pattern in packs.regex_rules:
+        found = pattern.search(text)
+        if found is not None and (best is None or (found.start(), order) < best[:2]):
+            best = (found.start(), order, pack, rule, found.group(0))
+    return best[2:] if best is not None else None
+
+
+class RulePackEngine:
+    """
+    Keyword/regex guardrail backed by rule-pack files in a directory.
+
+    Packs are recompiled when a file is added, removed or changed, and the
+    compiled generation is swapped in with a single assignment: a check that
+    is already running finishes on the generation it started with. A pack
+    that fails to load or compile leaves the previous generation in place.
+    """
+
+    def __init__(self, directory: str, check_interval: float = RULES_CHECK_INTERVAL):
+        self.directory = directory
+        self.check_interval = check_interval
+        self.hits: Counter[str] = Counter()
+        self.checks = 0
+        self.reloads = 0
+        self.reload_errors = 0
+        self.last_error: str | None = None
+        self._latency_total = 0.0
+        self._latency_max = 0.0
+        self._signature = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        self._packs = CompiledPacks({}, None, {}, [])
+        self._reload_if_changed(force=True)
+
+    def match(self, text: str) -> RuleMatch | None:
+        """Returns the first rule that matches the text, or None."""
+        self._reload_if_changed()
+        packs = self._packs  # this check keeps using the generation it started with
+        started = time.perf_counter()
+        found = first_match(packs, text)
+        elapsed = time.perf_counter() - started
+
+        with self._lock:
+            self.checks += 1
+            self._latency_total += elapsed
+            self._latency_max = max(self._latency_max, elapsed)
+            if found is None:
+                return None
+            pack, rule, matched = found
+            self.hits[f"{pack}/{rule}"] += 1
+        return RuleMatch(pack, rule, matched)
+
+    def stats(self) -> dict:
+        """Returns pack versions, per-rule hits and match latency for monitoring."""
+        with self._lock:
+            return {
+                "versions": dict(self._packs.versions),
+                "hits": dict(self.hits),
+                "checks": self.checks,
+                "avg_latency_us": round(self._latency_total / self.checks * 1e6, 1) if self.checks else 0.0,
+                "max_latency_us": round(self._latency_max * 1e6, 1),
+                "reloads": self.reloads,
+                "reload_errors": self.reload_errors,
+                "last_error": self.last_error,
+            }
+
+    def _reload_if_changed(self, force: bool = False) -> None:
+        now = time.monotonic()
+        if not force and now - self._checked_at < self.check_interval:
+            return
+        with self._lock:
+            if not force and now - self._checked_at < self.check_interval:
+                return
+            self._checked_at = now
+            signature = None
+            try:
+                paths = sorted(
+                    os.path.join(self.directory, name)
+                    for name in os.listdir(self.directory)
+                    if name.endswith(".json")
+                ) if os.path.isdir(self.directory) else []
+                signature = tuple((p, os.stat(p).st_mtime_ns, os.stat(p).st_size) for p in paths)
+                if signature == self._signature:
+                    return
+                compiled = compile_packs([load_pack(p) for p in paths])
+            except (OSError, ValueError, KeyError, re.error) as e:
+                # Keep serving the previous generation until the files are fixed;
+                # a broken file is not retried until it changes again
+                self.reload_errors += 1
+                self.last_error = f"{type(e).__name__}: {e}"
+                self._signature = signature
+                return
+            self._packs = compiled
+            self._signature = signature
+            self.reloads += 1
+            self.last_error = None